@@ -0,0 +1,271 @@
+import json
+import operator
+import os
+from datetime import datetime
+
+import numpy as np
+
+from ports import DESTINATION_NAMES, LANE_LABELS, N_LANES, lane_codes
+from records import decode_column
+from risk_engine import STATUS_LABELS
+
+# Alertas individuales por regla y evaluación; el resto se resume en una sola alerta
+DEFAULT_MAX_ALERTS_PER_RULE = 50
+
+OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# ============================================
+# REGLAS
+# ============================================
+
+class Rule:
+    """Regla de alerta declarativa.
+
+    Tipos (`kind`):
+      - "status": `status` es el estado que dispara (p. ej. "CRÍTICO")
+      - "stockout_margin": Días_Stock_Cero < Tránsito_Total + `buffer`
+      - "threshold": `column` `op` `value` sobre cualquier columna pública numérica
+      - "lane_value_at_risk": valor en riesgo agregado de una ruta > `threshold`
+    """
+
+    def __init__(self, name, kind, severity="alta", **params):
+        self.name = name
+        self.kind = kind
+        self.severity = severity
+        self.params = params
+
+    @property
+    def per_lane(self):
+        return self.kind == "lane_value_at_risk"
+
+    @property
+    def definition(self):
+        """Todo lo que determina cuándo dispara la regla y cómo se reporta (sin el nombre)"""
+        return self.kind, self.severity, tuple(sorted(self.params.items()))
+
+def compile_rule(rule):
+    """Predicado vectorizado `f(columnas internas de las filas) -> máscara bool`"""
+    params = rule.params
+    if rule.kind == "status":
+        code = STATUS_LABELS.index(params["status"])
+        return lambda c: c["status"] == code
+    if rule.kind == "stockout_margin":
+        buffer_tenths = round(params["buffer"] * 10)
+        return lambda c: c["stock_days_tenths"] < (c["transit_total"].astype(np.int32) * 10 + buffer_tenths)
+    if rule.kind == "threshold":
+        compare = OPERATORS[params["op"]]
+        column, value = params["column"], params["value"]
+        return lambda c: compare(decode_column(column, c), value)
+    raise ValueError(f"Tipo de regla desconocido: {rule.kind}")
+
+# ============================================
+# SINKS
+# ============================================
+
+class FileSink:
+    """Agrega cada alerta como una línea JSON al archivo"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def send(self, alerts):
+        with open(self.path, "a", encoding="utf-8") as handle:
+            for alert in alerts:
+                handle.write(json.dumps(alert, ensure_ascii=False) + "\n")
+
+class WebhookSink:
+    """Sustituto local de un webhook: arma el payload por lote y lo entrega a `transport`.
+
+    Sin `transport`, los payloads quedan en `outbox` (útil para pruebas y demos offline).
+    """
+
+    def __init__(self, transport=None):
+        self.outbox = []
+        self._transport = transport or self.outbox.append
+
+    def send(self, alerts):
+        self._transport(json.dumps({"alerts": alerts, "count": len(alerts)}, ensure_ascii=False))
+
+# ============================================
+# MOTOR DE EVALUACIÓN INCREMENTAL
+# ============================================
+
+class AlertEngine:
+    """Evalúa reglas sólo sobre las filas cambiadas desde la evaluación anterior.
+
+    Una alerta se emite cuando la condición pasa de falsa a verdadera para un envío (o
+    ruta) y no se repite mientras siga activa; el estado activo por regla se guarda como
+    bits por fila. Las reglas se identifican por nombre al reemplazarlas (`replace_rules`).
+    """
+
+    def __init__(self, rules, sinks=(), max_alerts_per_rule=DEFAULT_MAX_ALERTS_PER_RULE):
+        self.sinks = list(sinks)
+        self.max_alerts_per_rule = max_alerts_per_rule
+        self._compile(rules)
+        self._reset(None)
+
+    def _compile(self, rules):
+        self.rules = list(rules)
+        self._row_rules = [(bit, rule, compile_rule(rule))
+                           for bit, rule in enumerate(r for r in self.rules if not r.per_lane)]
+        self._lane_rules = [rule for rule in self.rules if rule.per_lane]
+
+    def _empty_active(self, size):
+        # Bits activos: una fila de bytes por cada 8 reglas, una columna por envío
+        return np.zeros((max(1, (len(self._row_rules) + 7) // 8), size), dtype=np.uint8)
+
+    def _reset(self, store):
+        self._store_id = id(store) if store is not None else None
+        self._seen_version = 0
+        # Reglas a reevaluar sobre todas las filas en la próxima evaluación
+        self._stale = set()
+        self._active = self._empty_active(0)
+        self._row_value_at_risk = np.zeros(0)
+        self._row_lane = np.zeros(0, dtype=np.int64)
+        self._lane_value_at_risk = np.zeros(N_LANES)
+        self._lane_active = np.zeros((len(self._lane_rules), N_LANES), dtype=bool)
+
+    def _grow(self, size):
+        extra = size - self._active.shape[1]
+        if extra <= 0:
+            return
+        self._active = np.hstack([self._active, np.zeros((self._active.shape[0], extra), dtype=np.uint8)])
+        self._row_value_at_risk = np.concatenate([self._row_value_at_risk, np.zeros(extra)])
+        self._row_lane = np.concatenate([self._row_lane, np.zeros(extra, dtype=np.int64)])
+
+    def replace_rules(self, rules):
+        """Cambia las reglas sin perder el estado activo de las que siguen.
+
+        Una regla con el mismo nombre y la misma definición conserva sus bits y no vuelve a
+        alertar. Si la definición cambió, conserva los bits y se reevalúa sobre todas las
+        filas en la próxima evaluación: sólo alertan los envíos (o rutas) que pasan a
+        cumplirla. Las reglas nuevas empiezan inactivas y también se evalúan completas.
+        """
+        previous_rows = {rule.name: (bit, rule) for bit, rule, _ in self._row_rules}
+        previous_lanes = {rule.name: (index, rule) for index, rule in enumerate(self._lane_rules)}
+        previous_active, previous_lane_active = self._active, self._lane_active
+        self._compile(rules)
+
+        self._active = self._empty_active(previous_active.shape[1])
+        for bit, rule, _ in self._row_rules:
+            old_bit, old_rule = previous_rows.get(rule.name, (None, None))
+            if old_rule is None or old_rule.definition != rule.definition:
+                self._stale.add(rule.name)
+            if old_rule is not None:
+                bits = (previous_active[old_bit // 8] >> (old_bit % 8)) & 1
+                self._active[bit // 8] |= bits << (bit % 8)
+
+        self._lane_active = np.zeros((len(self._lane_rules), N_LANES), dtype=bool)
+        for index, rule in enumerate(self._lane_rules):
+            old_index, old_rule = previous_lanes.get(rule.name, (None, None))
+            if old_rule is None or old_rule.definition != rule.definition:
+                self._stale.add(rule.name)
+            if old_rule is not None:
+                self._lane_active[index] = previous_lane_active[old_index]
+
+    @property
+    def lane_value_at_risk(self):
+        return dict(zip(LANE_LABELS, self._lane_value_at_risk))
+
+    def evaluate(self, store, now=None):
+        """Evalúa las reglas sobre los cambios del almacén; devuelve y despacha las alertas nuevas"""
+        if id(store) != self._store_id or len(store) < self._active.shape[1]:
+            self._reset(store)
+        rows = store.changed_rows(self._seen_version)
+        self._seen_version = store.version
+        self._grow(len(store))
+        stale, self._stale = self._stale, set()
+        if len(rows) == 0 and not stale:
+            return []
+
+        columns = store.columns
+        subset = {name: array[rows] for name, array in columns.items()}
+        timestamp = (now or datetime.now()).isoformat(timespec="seconds")
+        alerts = []
+
+        for bit, rule, predicate in self._row_rules:
+            if rule.name in stale:
+                rule_rows, rule_subset = np.arange(len(store)), columns
+            else:
+                rule_rows, rule_subset = rows, subset
+            byte, mask = bit // 8, np.uint8(1 << (bit % 8))
+            now_true = np.asarray(predicate(rule_subset), dtype=bool)
+            active = self._active[byte]
+            current = active[rule_rows]
+            fired = np.flatnonzero(now_true & ((current & mask) == 0))
+            active[rule_rows] = np.where(now_true, current | mask, current & ~mask)
+            if len(fired):
+                alerts.extend(self._row_alerts(rule, rule_subset, fired, timestamp))
+
+        if self._lane_rules:
+            alerts.extend(self._evaluate_lanes(rows, subset, timestamp))
+
+        for sink in self.sinks:
+            if alerts:
+                sink.send(alerts)
+        return alerts
+
+    def _row_alerts(self, rule, subset, fired, timestamp):
+        shown = fired[:self.max_alerts_per_rule]
+        picked = {name: array[shown] for name, array in subset.items()}
+        ids = decode_column("ID", picked)
+        destinations = DESTINATION_NAMES[picked["destination"]]
+        status = decode_column("Estado", picked)
+        alerts = [
+            {
+                "timestamp": timestamp,
+                "rule": rule.name,
+                "severity": rule.severity,
+                "shipment": shipment_id,
+                "destination": destination,
+                "status": state,
+                "message": f"{rule.name}: {shipment_id} ({state}) hacia {destination}",
+            }
+            for shipment_id, destination, state in zip(ids, destinations, status)
+        ]
+        hidden = len(fired) - len(shown)
+        if hidden > 0:
+            alerts.append({
+                "timestamp": timestamp,
+                "rule": rule.name,
+                "severity": rule.severity,
+                "shipment": None,
+                "count": hidden,
+                "message": f"{rule.name}: {hidden} envíos más",
+            })
+        return alerts
+
+    def _evaluate_lanes(self, rows, subset, timestamp):
+        """Actualiza el valor en riesgo por ruta con la diferencia de las filas cambiadas"""
+        new_value = subset["cargo_value"] * (subset["risk_tenths"] / 1000)
+        new_lane = lane_codes(subset["origin"], subset["destination"])
+        self._lane_value_at_risk -= np.bincount(self._row_lane[rows], weights=self._row_value_at_risk[rows],
+                                                minlength=N_LANES)
+        self._lane_value_at_risk += np.bincount(new_lane, weights=new_value, minlength=N_LANES)
+        self._row_value_at_risk[rows] = new_value
+        self._row_lane[rows] = new_lane
+
+        alerts = []
+        for index, rule in enumerate(self._lane_rules):
+            now_true = self._lane_value_at_risk > rule.params["threshold"]
+            for lane in np.flatnonzero(now_true & ~self._lane_active[index]):
+                alerts.append({
+                    "timestamp": timestamp,
+                    "rule": rule.name,
+                    "severity": rule.severity,
+                    "lane": LANE_LABELS[lane],
+                    "value": round(float(self._lane_value_at_risk[lane]), 2),
+                    "message": f"{rule.name}: {LANE_LABELS[lane]} con ${self._lane_value_at_risk[lane]:,.0f} en riesgo",
+                })
+            self._lane_active[index] = now_true
+        return alerts
@@ -0,0 +1,214 @@
+"""Servicio headless de scoring (ASGI) sobre el motor de riesgo.
+
+Ejecutar: python api.py --workers 4 --port 8000
+"""
+import argparse
+import json
+import os
+from datetime import date
+
+import numpy as np
+
+from risk_engine import (
+    DEFAULT_STOCKOUT_BUFFER, STATUS_LABELS, STOCKOUT_LABELS, STOCKOUT_ICONS,
+    risk_scores, risk_delays, status_codes, stockout_codes,
+)
+
+MAX_BATCH_SIZE = 1_000_000
+MAX_BODY_BYTES = 256 * 2**20
+
+# Campos de entrada (mismos nombres que las columnas del dashboard)
+INPUT_FIELDS = [
+    "Riesgo_Clima", "Congestión_Puerto", "Estabilidad_Social",
+    "Tránsito_Base", "Inventario_Actual", "Consumo_Diario",
+]
+
+# Factores de riesgo en escala 0-100 y límites de los campos enteros positivos (un tránsito
+# o inventario fuera de rango daría ETAs o días de stock sin sentido)
+FACTOR_FIELDS = ["Riesgo_Clima", "Congestión_Puerto", "Estabilidad_Social"]
+INTEGER_LIMITS = {"Tránsito_Base": 3650, "Inventario_Actual": 10**9}
+
+# Nombres JSON de los tipos que produce json.loads, para los mensajes de error
+JSON_TYPE_NAMES = {list: "array", str: "string", int: "number", float: "number", bool: "boolean", type(None): "null"}
+
+STATUS_NAMES = np.array(STATUS_LABELS, dtype=object)
+STOCKOUT_NAMES = np.array(STOCKOUT_LABELS, dtype=object)
+STOCKOUT_ICON_NAMES = np.array(STOCKOUT_ICONS, dtype=object)
+
+class BadRequest(ValueError):
+    pass
+
+# ============================================
+# SCORING POR LOTES
+# ============================================
+
+def parse_batch(payload):
+    """Acepta {"columns": {campo: [...]}} (preferido) o {"shipments": [{campo: valor}, ...]}"""
+    if not isinstance(payload, dict):
+        raise BadRequest("El cuerpo debe ser un objeto JSON")
+    if "columns" in payload:
+        raw = payload["columns"]
+        if not isinstance(raw, dict):
+            raise BadRequest("'columns' debe ser un objeto campo -> lista")
+        missing = [field for field in INPUT_FIELDS if field not in raw]
+        if missing:
+            raise BadRequest(f"Faltan campos: {missing}")
+        columns = {field: raw[field] for field in INPUT_FIELDS}
+    elif "shipments" in payload:
+        rows = payload["shipments"]
+        if not isinstance(rows, list):
+            raise BadRequest("'shipments' debe ser una lista")
+        for index, row in enumerate(rows):
+            if not isinstance(row, dict):
+                raise BadRequest(f"Envío {index} inválido: se esperaba un objeto campo -> valor, no {JSON_TYPE_NAMES.get(type(row), type(row).__name__)}")
+            missing = [field for field in INPUT_FIELDS if field not in row]
+            if missing:
+                raise BadRequest(f"Envío {index} inválido, faltan campos: {missing}")
+        columns = {field: [row[field] for row in rows] for field in INPUT_FIELDS}
+    else:
+        raise BadRequest("Se esperaba 'columns' o 'shipments'")
+
+    try:
+        arrays = {field: np.asarray(values, dtype=np.float64) for field, values in columns.items()}
+    except (TypeError, ValueError):
+        raise BadRequest("Todos los campos deben ser numéricos") from None
+
+    lengths = {array.shape for array in arrays.values()}
+    if len(lengths) != 1 or len(next(iter(lengths))) != 1:
+        raise BadRequest("Todas las columnas deben ser listas de igual longitud")
+    if len(arrays["Consumo_Diario"]) > MAX_BATCH_SIZE:
+        raise BadRequest(f"Máximo {MAX_BATCH_SIZE} envíos por lote")
+    for field, array in arrays.items():
+        if not np.isfinite(array).all():
+            raise BadRequest(f"{field} no admite NaN ni infinitos")
+    for field in FACTOR_FIELDS:
+        if np.any((arrays[field] < 0) | (arrays[field] > 100)):
+            raise BadRequest(f"{field} debe estar entre 0 y 100")
+    for field, limit in INTEGER_LIMITS.items():
+        array = arrays[field]
+        if np.any((array < 1) | (array > limit) | (array != np.floor(array))):
+            raise BadRequest(f"{field} debe ser un entero entre 1 y {limit}")
+    if np.any(arrays["Consumo_Diario"] <= 0):
+        raise BadRequest("Consumo_Diario debe ser mayor que 0")
+    with np.errstate(over="ignore"):
+        days_to_zero = arrays["Inventario_Actual"] / arrays["Consumo_Diario"]
+    if not np.isfinite(days_to_zero).all():
+        raise BadRequest("Consumo_Diario demasiado chico")
+    return arrays
+
+def score_batch(arrays, stockout_buffer=DEFAULT_STOCKOUT_BUFFER, base_date=None):
+    """Score, retraso, tránsito total, ETA, estado y predicción de desabasto de un lote"""
+    score = risk_scores(arrays["Riesgo_Clima"], arrays["Congestión_Puerto"], arrays["Estabilidad_Social"])
+    delay = risk_delays(score)
+    transit_total = arrays["Tránsito_Base"].astype(np.int64) + delay
+    days_to_zero = arrays["Inventario_Actual"] / arrays["Consumo_Diario"]
+    status = status_codes(score, days_to_zero, transit_total)
+    stockout = stockout_codes(arrays["Inventario_Actual"], arrays["Consumo_Diario"], transit_total, stockout_buffer)
+
+    base_day = np.datetime64(base_date or date.today(), "D")
+    eta = np.datetime_as_string(base_day + transit_total, unit="D")
+
+    return {
+        "Score_Riesgo": score.tolist(),
+        "Retraso": delay.tolist(),
+        "Tránsito_Total": transit_total.tolist(),
+        "ETA": eta.tolist(),
+        "Días_Stock_Cero": np.round(days_to_zero, 1).tolist(),
+        "Estado": STATUS_NAMES[status].tolist(),
+        "Predicción_Desabasto": STOCKOUT_NAMES[stockout].tolist(),
+        "Indicador": STOCKOUT_ICON_NAMES[stockout].tolist(),
+    }
+
+# ============================================
+# APLICACIÓN ASGI
+# ============================================
+
+async def _read_body(receive):
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise BadRequest("Cuerpo demasiado grande")
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+async def _send_json(send, status, payload):
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+async def _score(receive):
+    try:
+        payload = json.loads(await _read_body(receive))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise BadRequest("JSON inválido") from None
+
+    arrays = parse_batch(payload)
+    options = payload.get("options", {})
+    if not isinstance(options, dict):
+        raise BadRequest("'options' debe ser un objeto")
+    try:
+        stockout_buffer = float(options.get("stockout_buffer", DEFAULT_STOCKOUT_BUFFER))
+        base_date = date.fromisoformat(options["base_date"]) if "base_date" in options else None
+        if not np.isfinite(stockout_buffer):
+            raise ValueError
+    except (TypeError, ValueError):
+        raise BadRequest("Opciones inválidas: stockout_buffer numérico, base_date YYYY-MM-DD") from None
+    return {"count": len(arrays["Consumo_Diario"]), "results": score_batch(arrays, stockout_buffer, base_date)}
+
+async def app(scope, receive, send):
+    """Rutas: GET /health, POST /v1/score"""
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+
+    path, method = scope["path"], scope["method"]
+    if path == "/health":
+        await _send_json(send, 200, {"status": "ok", "pid": os.getpid()})
+    elif path == "/v1/score":
+        if method != "POST":
+            await _send_json(send, 405, {"error": "Usa POST"})
+            return
+        try:
+            await _send_json(send, 200, await _score(receive))
+        except BadRequest as exc:
+            await _send_json(send, 400, {"error": str(exc)})
+    else:
+        await _send_json(send, 404, {"error": f"Ruta no encontrada: {path}"})
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Servicio de scoring de envíos")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--keep-alive", type=int, default=30, help="segundos de keep-alive HTTP")
+    args = parser.parse_args()
+
+    uvicorn.run(
+        "api:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_keep_alive=args.keep_alive,
+        lifespan="on",
+        access_log=False,
+    )
@@ -1,11 +1,36 @@
+import time
+_run_start = time.perf_counter()
+
+import atexit
+import os
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime, timedelta
-import random
-from plotly.subplots import make_subplots
+
+from startup import LOGO_PATH, record_run, stylesheet
+from ports import ORIGIN_PORTS, DESTINATION_PORTS, CARGO_TYPES, ROUTE_ARC_DEGREES, route_position
+from records import ShipmentStore
+from recalculation import FleetRecalculator
+from history import SnapshotStore
+from filters import FleetFilter, FleetIndex
+from queueing import apply_port_queues, backlog_frame, fleet_berth_capacity
+from generation import IdAllocator, generate_fleet
+from alerts import AlertEngine, Rule, FileSink, WebhookSink
+from risk_engine import DEFAULT_WEIGHTS, DEFAULT_THRESHOLDS, DEFAULT_MAX_DELAY_DAYS
+from scenarios import build_scenario_grid, fleet_arrays, scenario_frame, scenario_sweep_block, monte_carlo_block, combine_frames
+from executor import JobExecutor
+from replenishment import iter_replenishment_plan, DEFAULT_EXPEDITE_SLOTS, DEFAULT_EXPEDITE_DAYS
+
+# Alertas: log JSON lines local (junto al módulo, no al directorio de trabajo) y cantidad
+# de alertas recientes mostradas
+ALERTS_LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "alerts.jsonl")
+MAX_ALERT_LOG = 200
+
+EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+DEFAULT_GENERATION_SEED = 42
 
 # Configuración de la página
 st.set_page_config(
@@ -15,76 +40,33 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# CSS personalizado para mejorar la apariencia
-st.markdown("""
-<style>
-    .main {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        background-attachment: fixed;
-    }
-    .stApp {
-        background: rgba(255, 255, 255, 0.95);
-    }
-    div[data-testid="metric-container"] {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        border-radius: 10px;
-        padding: 15px;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        color: white;
-    }
-    div[data-testid="metric-container"] label {
-        color: white !important;
-    }
-    div[data-testid="metric-container"] [data-testid="stMetricValue"] {
-        color: white;
-        font-size: 2rem;
-        font-weight: bold;
-    }
-    .css-1d391kg {
-        background: white;
-        border-radius: 10px;
-        padding: 20px;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-    }
-    h1 {
-        color: #667eea;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
-    }
-    h2, h3 {
-        color: #764ba2;
-    }
-</style>
-""", unsafe_allow_html=True)
+# CSS personalizado para mejorar la apariencia (static/styles.css, leído una vez por proceso)
+st.markdown(stylesheet(), unsafe_allow_html=True)
 
 # ============================================
 # INICIALIZACIÓN DE DATOS
 # ============================================
 
 if 'shipments_data' not in st.session_state:
-    st.session_state.shipments_data = []
+    st.session_state.shipments_data = ShipmentStore()
 
 if 'vessel_positions' not in st.session_state:
     st.session_state.vessel_positions = {}
 
-ORIGIN_PORTS = {
-    "Ningbo, China": {"lat": 29.8683, "lon": 121.5440, "code": "CNNGB"},
-    "Shanghai, China": {"lat": 31.2304, "lon": 121.4737, "code": "CNSHA"},
-    "Busan, Corea del Sur": {"lat": 35.1796, "lon": 129.0756, "code": "KRPUS"},
-    "Singapur": {"lat": 1.3521, "lon": 103.8198, "code": "SGSIN"},
-    "Hong Kong": {"lat": 22.3193, "lon": 114.1694, "code": "HKHKG"},
-    "Shenzhen, China": {"lat": 22.5431, "lon": 114.0579, "code": "CNSZX"}
-}
+# IDs monótonos de envíos y buques (nunca se reutilizan, ni tras limpiar) y RNG sembrado
+if 'id_allocator' not in st.session_state:
+    st.session_state.id_allocator = IdAllocator.for_store(st.session_state.shipments_data)
+    st.session_state.generation_rng = np.random.default_rng(DEFAULT_GENERATION_SEED)
 
-DESTINATION_PORTS = {
-    "Puerto Caucedo, RD": {"lat": 18.4264, "lon": -69.6618, "code": "DOCAU"},
-    "Puerto de Balboa, Panamá": {"lat": 8.9517, "lon": -79.5671, "code": "PABLB"},
-    "Puerto de Colón, Panamá": {"lat": 9.3592, "lon": -79.9009, "code": "PAONX"},
-    "Puerto de Cartagena, Colombia": {"lat": 10.3932, "lon": -75.5144, "code": "COCTG"},
-    "Puerto de Veracruz, México": {"lat": 19.2006, "lon": -96.1429, "code": "MXVER"}
-}
+if 'history' not in st.session_state:
+    st.session_state.history = SnapshotStore()
+    st.session_state.history_key = None
 
-# Tipos de carga
-CARGO_TYPES = ["Electrónicos", "Textiles", "Maquinaria", "Alimentos", "Químicos", "Automotriz"]
+if 'alert_log' not in st.session_state:
+    st.session_state.alert_log = []
+    st.session_state.alert_engine = None
+    st.session_state.alert_config = None
+    st.session_state.alert_webhook = WebhookSink()
 
 # ============================================
 # FUNCIONES DE SIMULACIÓN AVANZADA
@@ -98,26 +80,29 @@ def calculate_vessel_position(origin, destination, days_elapsed, total_days):
     lon = origin["lon"] + (destination["lon"] - origin["lon"]) * progress
     
     # Agregar algo de variación para simular rutas marítimas
-    variation = np.sin(progress * np.pi) * 2
+    variation = np.sin(progress * np.pi) * ROUTE_ARC_DEGREES
     lat += variation
     
     return {"lat": lat, "lon": lon, "progress": progress * 100}
 
-def calculate_risk_score(climate, congestion, stability):
-    return round(climate * 0.3 + congestion * 0.5 + stability * 0.2, 1)
+def calculate_risk_score(climate, congestion, stability, weights=DEFAULT_WEIGHTS):
+    w_climate, w_congestion, w_stability = weights
+    return round(climate * w_climate + congestion * w_congestion + stability * w_stability, 1)
 
-def calculate_status(risk_score, days_to_zero, transit_total):
+def calculate_status(risk_score, days_to_zero, transit_total, thresholds=DEFAULT_THRESHOLDS):
+    medium, high = thresholds
     if days_to_zero < transit_total:
         return "CRÍTICO"
-    elif risk_score > 70:
+    elif risk_score > high:
         return "ALTO RIESGO"
-    elif risk_score > 40:
+    elif risk_score > medium:
         return "RIESGO MEDIO"
     else:
         return "NORMAL"
 
 def generate_shipment_data(form_data=None):
-    """Genera un nuevo envío con datos detallados"""
+    """Genera un nuevo envío con datos detallados (IDs del asignador, azar del RNG sembrado de la sesión)"""
+    rng = st.session_state.generation_rng
     if form_data:
         origin = form_data["origin"]
         destination = form_data["destination"]
@@ -130,32 +115,33 @@ def generate_shipment_data(form_data=None):
         cargo_type = form_data["cargo_type"]
         cargo_value = form_data["cargo_value"]
     else:
-        origin = random.choice(list(ORIGIN_PORTS.keys()))
-        destination = random.choice(list(DESTINATION_PORTS.keys()))
-        transit_base = random.randint(25, 40)
-        inventory = random.randint(100, 500)
-        consumption = random.randint(5, 25)
-        climate = random.randint(0, 100)
-        congestion = random.randint(0, 100)
-        stability = random.randint(0, 100)
-        cargo_type = random.choice(CARGO_TYPES)
-        cargo_value = random.randint(50000, 500000)
+        origin = list(ORIGIN_PORTS)[rng.integers(len(ORIGIN_PORTS))]
+        destination = list(DESTINATION_PORTS)[rng.integers(len(DESTINATION_PORTS))]
+        transit_base = int(rng.integers(25, 41))
+        inventory = int(rng.integers(100, 501))
+        consumption = int(rng.integers(5, 26))
+        climate = int(rng.integers(0, 101))
+        congestion = int(rng.integers(0, 101))
+        stability = int(rng.integers(0, 101))
+        cargo_type = CARGO_TYPES[rng.integers(len(CARGO_TYPES))]
+        cargo_value = int(rng.integers(50000, 500001))
     
     risk_score = calculate_risk_score(climate, congestion, stability)
-    delay = int((risk_score / 100) * 15)
+    delay = int((risk_score / 100) * DEFAULT_MAX_DELAY_DAYS)
     transit_total = transit_base + delay
     days_to_zero = inventory / consumption
     eta = datetime.now() + timedelta(days=transit_total)
     status = calculate_status(risk_score, days_to_zero, transit_total)
     
     # Calcular fecha de zarpe
-    departure_date = datetime.now() - timedelta(days=random.randint(0, 10))
+    departure_date = datetime.now() - timedelta(days=int(rng.integers(0, 11)))
     days_in_transit = (datetime.now() - departure_date).days
     
-    vessel_id = f"VSL-{random.randint(1000, 9999)}"
+    shipment_num, vessel_num = st.session_state.id_allocator.allocate(1)
+    vessel_id = f"VSL-{vessel_num}"
     
     shipment = {
-        "ID": f"SHP-{1000+len(st.session_state.shipments_data)}",
+        "ID": f"SHP-{shipment_num}",
         "Vessel_ID": vessel_id,
         "Origen": origin,
         "Destino": destination,
@@ -165,6 +151,7 @@ def generate_shipment_data(form_data=None):
         "Dest_Lon": DESTINATION_PORTS[destination]["lon"],
         "Tránsito_Base": transit_base,
         "Retraso": delay,
+        "Espera_Puerto": 0,
         "Tránsito_Total": transit_total,
         "Días_Transcurridos": days_in_transit,
         "ETA": eta.strftime("%Y-%m-%d"),
@@ -179,8 +166,8 @@ def generate_shipment_data(form_data=None):
         "Estado": status,
         "Tipo_Carga": cargo_type,
         "Valor_Carga_USD": cargo_value,
-        "Velocidad_Nudos": round(random.uniform(12, 18), 1),
-        "Distancia_Restante_NM": round((1 - (days_in_transit / transit_total)) * random.uniform(8000, 12000), 0),
+        "Velocidad_Nudos": round(rng.uniform(12, 18), 1),
+        "Distancia_Restante_NM": round((1 - (days_in_transit / transit_total)) * rng.uniform(8000, 12000), 0),
         "Fecha_Creación": datetime.now().strftime("%Y-%m-%d %H:%M")
     }
     
@@ -196,6 +183,15 @@ def generate_shipment_data(form_data=None):
     
     return shipment
 
+def register_vessel_positions(columns):
+    """Posiciones de los buques de un lote generado (misma curva que `calculate_vessel_position`)"""
+    progress = np.minimum(columns["days_elapsed"] / columns["transit_total"], 1.0)
+    lat, lon = route_position(columns["origin"], columns["destination"], progress)
+    for vessel_num, vessel_lat, vessel_lon, vessel_progress in zip(columns["vessel_num"], lat, lon, progress):
+        st.session_state.vessel_positions[f"VSL-{vessel_num}"] = {
+            "lat": float(vessel_lat), "lon": float(vessel_lon), "progress": float(vessel_progress) * 100
+        }
+
 def predict_stockout_risk(inventory, daily_consumption, transit_days, threshold_days=5):
     days_to_stockout = inventory / daily_consumption
     buffer = days_to_stockout - transit_days
@@ -211,100 +207,13 @@ def predict_stockout_risk(inventory, daily_consumption, transit_days, threshold_
 # FUNCIONES DE VISUALIZACIÓN AVANZADA
 # ============================================
 
-def create_advanced_route_map(df, selected_status, show_vessels=True):
-    """Crea un mapa 3D interactivo con rutas y barcos"""
-    if df.empty:
-        return None
-    
-    if selected_status != "Todos":
-        df_filtered = df[df["Estado"] == selected_status]
-    else:
-        df_filtered = df
-    
+def create_advanced_route_map(df_filtered, show_vessels=True):
+    """Crea un mapa 3D interactivo con rutas y barcos (recibe la vista ya filtrada)"""
     if df_filtered.empty:
         return None
     
-    fig = go.Figure()
-    
-    color_map = {
-        "CRÍTICO": "#FF0000",
-        "ALTO RIESGO": "#FF8C00",
-        "RIESGO MEDIO": "#FFD700",
-        "NORMAL": "#00FF00"
-    }
-    
-    # Agregar rutas con animación
-    for idx, row in df_filtered.iterrows():
-        color = color_map.get(row["Estado"], "blue")
-        
-        # Línea de ruta con gradiente
-        fig.add_trace(go.Scattergeo(
-            lon=[row["Origin_Lon"], row["Dest_Lon"]],
-            lat=[row["Origin_Lat"], row["Dest_Lat"]],
-            mode='lines',
-            line=dict(width=3, color=color),
-            opacity=0.7,
-            hoverinfo='skip',
-            showlegend=False
-        ))
-        
-        # Marcador de origen (grande)
-        fig.add_trace(go.Scattergeo(
-            lon=[row["Origin_Lon"]],
-            lat=[row["Origin_Lat"]],
-            mode='markers+text',
-            marker=dict(size=15, color='#1E90FF', symbol='circle', 
-                       line=dict(width=2, color='white')),
-            text=row["Origen"].split(",")[0],
-            textposition="top center",
-            textfont=dict(size=10, color='black', family='Arial Black'),
-            hovertemplate=f"<b>Puerto Origen:</b> {row['Origen']}<br><b>ID Envío:</b> {row['ID']}<extra></extra>",
-            showlegend=False
-        ))
-        
-        # Marcador de destino (grande)
-        fig.add_trace(go.Scattergeo(
-            lon=[row["Dest_Lon"]],
-            lat=[row["Dest_Lat"]],
-            mode='markers+text',
-            marker=dict(size=18, color=color, symbol='square',
-                       line=dict(width=2, color='white')),
-            text=row["Destino"].split(",")[0],
-            textposition="bottom center",
-            textfont=dict(size=10, color='black', family='Arial Black'),
-            hovertemplate=f"<b>Puerto Destino:</b> {row['Destino']}<br><b>Estado:</b> {row['Estado']}<br><b>ETA:</b> {row['ETA']}<extra></extra>",
-            showlegend=False
-        ))
-        
-        # Posición del barco en tránsito
-        if show_vessels and row["Vessel_ID"] in st.session_state.vessel_positions:
-            vessel_pos = st.session_state.vessel_positions[row["Vessel_ID"]]
-            
-            fig.add_trace(go.Scattergeo(
-                lon=[vessel_pos["lon"]],
-                lat=[vessel_pos["lat"]],
-                mode='markers+text',
-                marker=dict(
-                    size=20,
-                    color='white',
-                    symbol='circle',
-                    line=dict(width=3, color=color)
-                ),
-                text='🚢',
-                textfont=dict(size=20),
-                hovertemplate=f"""
-                <b>Vessel ID:</b> {row['Vessel_ID']}<br>
-                <b>Envío:</b> {row['ID']}<br>
-                <b>Progreso:</b> {vessel_pos['progress']:.1f}%<br>
-                <b>Velocidad:</b> {row['Velocidad_Nudos']} nudos<br>
-                <b>Distancia restante:</b> {row['Distancia_Restante_NM']:.0f} NM<br>
-                <b>Tipo carga:</b> {row['Tipo_Carga']}<br>
-                <b>Valor:</b> ${row['Valor_Carga_USD']:,.0f}<br>
-                <b>Estado:</b> {row['Estado']}<br>
-                <extra></extra>
-                """,
-                showlegend=False
-            ))
+    # Pocas trazas (por estado y tipo de puerto) en lugar de varias por envío
+    fig = go.Figure(route_map_traces(df_filtered, st.session_state.vessel_positions, show_vessels))
     
     fig.update_layout(
         title={
@@ -337,10 +246,10 @@ def create_advanced_route_map(df, selected_status, show_vessels=True):
     return fig
 
 def create_risk_timeline(df):
-    """Crea una línea de tiempo de riesgos por envío"""
+    """Crea una línea de tiempo de riesgos por envío (los de mayor score si son muchos)"""
     fig = go.Figure()
     
-    df_sorted = df.sort_values('Score_Riesgo', ascending=True)
+    df_sorted = top_rows(df, 'Score_Riesgo').sort_values('Score_Riesgo', ascending=True)
     
     colors = df_sorted['Estado'].map({
         'CRÍTICO': '#FF0000',
@@ -363,10 +272,10 @@ def create_risk_timeline(df):
     ))
     
     fig.update_layout(
-        title='📊 Score de Riesgo por Envío',
+        title='📊 Score de Riesgo por Envío' + (f' (top {len(df_sorted)} de {len(df)})' if len(df_sorted) < len(df) else ''),
         xaxis_title='Score de Riesgo (0-100)',
         yaxis_title='ID de Envío',
-        height=max(400, len(df) * 30),
+        height=max(400, len(df_sorted) * 30),
         showlegend=False,
         plot_bgcolor='rgba(0,0,0,0)',
         paper_bgcolor='rgba(255,255,255,0.95)',
@@ -421,7 +330,8 @@ def create_inventory_gauge(df):
     return fig
 
 def create_3d_risk_scatter(df):
-    """Crea un scatter 3D de riesgos"""
+    """Crea un scatter 3D de riesgos (muestra equiespaciada si hay muchos envíos)"""
+    df = sample_rows(df)
     fig = go.Figure(data=[go.Scatter3d(
         x=df['Riesgo_Clima'],
         y=df['Congestión_Puerto'],
@@ -437,7 +347,7 @@ def create_3d_risk_scatter(df):
         ),
         text=df['ID'],
         textposition='top center',
-        hovertemplate='<b>%{text}</b><br>Clima: %{x}<br>Congestión: %{y}<br>Social: %{z}<br>Score: %{marker.color:.1f}<extra></extra>'
+        hovertemplate='<b>%{text}</b><br>Clima: %{x:.0f}<br>Congestión: %{y:.0f}<br>Social: %{z:.0f}<br>Score: %{marker.color:.1f}<extra></extra>'
     )])
     
     fig.update_layout(
@@ -457,6 +367,8 @@ def create_3d_risk_scatter(df):
 def create_value_at_risk_chart(df):
     """Calcula y visualiza el valor en riesgo"""
     df['Valor_en_Riesgo'] = df['Valor_Carga_USD'] * (df['Score_Riesgo'] / 100)
+    total = len(df)
+    df = top_rows(df, 'Valor_en_Riesgo')
     
     fig = go.Figure()
     
@@ -477,7 +389,7 @@ def create_value_at_risk_chart(df):
     ))
     
     fig.update_layout(
-        title='💰 Valor en Riesgo por Envío',
+        title='💰 Valor en Riesgo por Envío' + (f' (top {len(df)} de {total})' if len(df) < total else ''),
         xaxis_title='ID de Envío',
         yaxis_title='Valor USD',
         barmode='overlay',
@@ -488,6 +400,96 @@ def create_value_at_risk_chart(df):
     
     return fig
 
+# ============================================
+# TRABAJOS EN SEGUNDO PLANO
+# ============================================
+
+@st.cache_resource
+def get_job_executor():
+    """Pool de procesos compartido por todas las sesiones; se cierra al salir del servidor"""
+    executor = JobExecutor()
+    atexit.register(executor.shutdown)
+    return executor
+
+def show_scenario_job(grid, preset_names):
+    """Barrido what-if calculado en el pool de procesos; el resultado queda cacheado por entrada"""
+    job = st.session_state.scenario_job
+
+    if not job.done():
+        st.progress(job.progress, text=f"Evaluando escenarios... {job.progress * 100:.0f}%")
+        return
+
+    # Al terminar, una rerun completa quita el refresco periódico del fragmento
+    if st.session_state.get("scenario_polling"):
+        st.session_state.scenario_polling = False
+        st.rerun()
+
+    if job.cancelled:
+        st.warning("Barrido de escenarios cancelado")
+        return
+    if job.error is not None:
+        st.error(f"El barrido de escenarios falló: {job.error}")
+        return
+
+    scenario_results = scenario_frame(grid, job.result())
+    scenario_results.insert(0, "Pesos", np.repeat(preset_names, len(scenario_results) // len(preset_names)))
+
+    fig_scenarios = px.bar(
+        scenario_results.drop_duplicates(["Pesos", "Umbral_Alto"]),
+        x="Pesos",
+        y=["CRÍTICO", "ALTO RIESGO", "RIESGO MEDIO", "NORMAL"],
+        facet_col="Umbral_Alto",
+        color_discrete_map={
+            "CRÍTICO": "#FF0000",
+            "ALTO RIESGO": "#FF8C00",
+            "RIESGO MEDIO": "#FFD700",
+            "NORMAL": "#00FF00"
+        },
+        title="Envíos por Estado en cada Escenario"
+    )
+    fig_scenarios.update_layout(height=400, paper_bgcolor='rgba(255,255,255,0.95)')
+    st.plotly_chart(compact_figure(fig_scenarios), use_container_width=True)
+
+    st.dataframe(
+        scenario_results.style.format({"Valor_en_Riesgo": "${:,.0f}", "Valor_Críticos": "${:,.0f}"}),
+        use_container_width=True
+    )
+
+def show_monte_carlo_job():
+    """Progreso y resultados de la simulación Monte Carlo sin bloquear el resto del dashboard"""
+    job = st.session_state.mc_job
+
+    if not job.done():
+        st.progress(job.progress, text=f"Simulando... {job.progress * 100:.0f}%")
+        if st.button("⏹️ Cancelar simulación"):
+            job.cancel()
+        return
+
+    # Al terminar, una rerun completa quita el refresco periódico del fragmento
+    if st.session_state.get("mc_polling"):
+        st.session_state.mc_polling = False
+        st.rerun()
+
+    if job.cancelled:
+        st.warning("Simulación cancelada")
+        return
+    if job.error is not None:
+        st.error(f"La simulación falló: {job.error}")
+        return
+
+    samples = job.result()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("🔴 Críticos (media)", f"{samples['CRÍTICO'].mean():.1f}")
+    with col2:
+        st.metric("🔴 Críticos (p95)", f"{samples['CRÍTICO'].quantile(0.95):.0f}")
+    with col3:
+        st.metric("⚠️ Valor en Riesgo (p95)", f"${samples['Valor_en_Riesgo'].quantile(0.95):,.0f}")
+
+    fig_mc = px.histogram(samples, x="Valor_en_Riesgo", nbins=40, title="Distribución del Valor en Riesgo")
+    fig_mc.update_layout(height=300, paper_bgcolor='rgba(255,255,255,0.95)')
+    st.plotly_chart(compact_figure(fig_mc), use_container_width=True)
+
 # ============================================
 # INTERFAZ PRINCIPAL
 # ============================================
@@ -500,7 +502,7 @@ st.markdown("### *Monitoreo Avanzado con Tracking en Tiempo Real*")
 # ============================================
 
 with st.sidebar:
-    st.image("https://cdn-icons-png.flaticon.com/512/3774/3774299.png", width=100)
+    st.image(LOGO_PATH, width=100)
     st.title("⚙️ Panel de Control")
     
     tabs = st.tabs(["📝 Nuevo Envío", "🔧 Configuración", "💾 Datos"])
@@ -570,7 +572,15 @@ with st.sidebar:
         stockout_buffer = st.slider("⏰ Buffer Días", 3, 15, 5, 1)
         status_filter = st.selectbox("🔍 Filtrar Estado", 
                                     ["Todos", "CRÍTICO", "ALTO RIESGO", "RIESGO MEDIO", "NORMAL"])
+        with st.expander("🔎 Filtros Avanzados"):
+            origin_filter = st.multiselect("Puerto origen", list(ORIGIN_PORTS.keys()), placeholder="Todos")
+            destination_filter = st.multiselect("Puerto destino", list(DESTINATION_PORTS.keys()), placeholder="Todos")
+            cargo_filter = st.multiselect("Tipo de carga", CARGO_TYPES, placeholder="Todos")
+            value_filter = st.slider("💵 Valor carga (USD)", 0, 1_000_000, (0, 1_000_000), 10_000)
+            risk_filter = st.slider("⚠️ Score de riesgo", 0, 100, (0, 100), 5)
+            eta_filter = st.date_input("📅 Ventana ETA", value=(), format="YYYY-MM-DD")
         show_vessels = st.checkbox("🚢 Mostrar Barcos en Mapa", value=True)
+        lane_alert_threshold = st.number_input("🚨 Alerta: valor en riesgo por ruta (USD)", 100_000, 50_000_000, 2_000_000, 100_000)
         
         st.markdown("---")
         st.markdown("**🎨 Tema de Visualización**")
@@ -583,23 +593,50 @@ with st.sidebar:
         col1, col2 = st.columns(2)
         with col1:
             num_samples = st.number_input("Cantidad", 5, 50, 10, 5)
+            generation_seed = st.number_input("🌱 Semilla", 0, 2**31 - 1, DEFAULT_GENERATION_SEED, 1)
             if st.button("🎲 Generar Datos", use_container_width=True):
-                for _ in range(num_samples):
-                    st.session_state.shipments_data.append(generate_shipment_data())
+                generated = generate_fleet(
+                    num_samples, generation_seed, st.session_state.id_allocator,
+                    now_minute=int((datetime.now() - datetime(1970, 1, 1)).total_seconds() // 60)
+                )
+                st.session_state.shipments_data.extend_columns(generated)
+                register_vessel_positions(generated)
                 st.success(f"✅ {num_samples} envíos generados")
                 st.rerun()
         
         with col2:
             if st.button("🗑️ Limpiar Todo", use_container_width=True):
-                st.session_state.shipments_data = []
+                st.session_state.shipments_data = ShipmentStore()
                 st.session_state.vessel_positions = {}
                 st.success("✅ Datos limpiados")
                 st.rerun()
         
         st.markdown(f"**📊 Total de envíos:** {len(st.session_state.shipments_data)}")
+
+        with st.expander("🌐 Actualizar Factores por Puerto"):
+            update_scope = st.radio("Ámbito", ["Puerto destino", "Puerto origen", "Ruta"], horizontal=True)
+            update_origin = None
+            update_destination = None
+            if update_scope in ("Puerto origen", "Ruta"):
+                update_origin = st.selectbox("Puerto origen", list(ORIGIN_PORTS.keys()), key="update_origin")
+            if update_scope in ("Puerto destino", "Ruta"):
+                update_destination = st.selectbox("Puerto destino", list(DESTINATION_PORTS.keys()), key="update_dest")
+
+            readings = {}
+            for factor, label in [("climate", "🌤️ Clima"), ("congestion", "🚧 Congestión"), ("stability", "⚡ Inestabilidad")]:
+                if st.checkbox(f"Actualizar {label}", value=factor == "congestion", key=f"update_{factor}_on"):
+                    readings[factor] = st.slider(label, 0, 100, 50, 5, key=f"update_{factor}")
+
+            if st.button("♻️ Recalcular envíos afectados", use_container_width=True):
+                if st.session_state.get("recalculator") is None or st.session_state.recalculator.store is not st.session_state.shipments_data:
+                    st.session_state.recalculator = FleetRecalculator(st.session_state.shipments_data)
+                rows = st.session_state.recalculator.update_factors(
+                    origin=update_origin, destination=update_destination, **readings
+                )
+                st.success(f"✅ {len(rows)} envíos recalculados")
         
         if st.session_state.shipments_data:
-            df_export = pd.DataFrame(st.session_state.shipments_data)
+            df_export = st.session_state.shipments_data.to_frame()
             csv = df_export.to_csv(index=False)
             st.download_button(
                 label="📥 Exportar CSV",
@@ -613,9 +650,40 @@ with st.sidebar:
 # DASHBOARD PRINCIPAL
 # ============================================
 
-df = pd.DataFrame(st.session_state.shipments_data)
+# Colas de atraque: la espera de cada buque depende de toda la flota, así que se simula
+# de nuevo cuando la flota cambió; sólo se reescriben los envíos cuya espera varió
+queue_key = (id(st.session_state.shipments_data), st.session_state.shipments_data.version)
+if st.session_state.get("queue_key") != queue_key:
+    apply_port_queues(st.session_state.shipments_data)
+    st.session_state.queue_key = (id(st.session_state.shipments_data), st.session_state.shipments_data.version)
+
+# Snapshot histórico cada vez que la flota cambió (altas, recálculos o limpieza)
+fleet_key = (id(st.session_state.shipments_data), st.session_state.shipments_data.version)
+if st.session_state.history_key != fleet_key:
+    st.session_state.history.snapshot(st.session_state.shipments_data)
+    st.session_state.history_key = fleet_key
+
+# Alertas: si cambia la configuración se reemplazan las reglas conservando el estado de
+# las que no cambiaron; cada ejecución evalúa únicamente los envíos modificados
+alert_config = (stockout_buffer, lane_alert_threshold)
+if st.session_state.alert_config != alert_config:
+    alert_rules = [
+        Rule("Envío crítico", "status", status="CRÍTICO"),
+        Rule("Desabasto antes de llegada", "stockout_margin", buffer=stockout_buffer),
+        Rule("Ruta con alto valor en riesgo", "lane_value_at_risk", severity="media",
+             threshold=lane_alert_threshold),
+    ]
+    if st.session_state.alert_engine is None:
+        st.session_state.alert_engine = AlertEngine(
+            alert_rules, sinks=[FileSink(ALERTS_LOG_PATH), st.session_state.alert_webhook],
+        )
+    else:
+        st.session_state.alert_engine.replace_rules(alert_rules)
+    st.session_state.alert_config = alert_config
+new_alerts = st.session_state.alert_engine.evaluate(st.session_state.shipments_data)
+st.session_state.alert_log = (new_alerts[::-1] + st.session_state.alert_log)[:MAX_ALERT_LOG]
 
-if df.empty:
+if not st.session_state.shipments_data:
     st.info("👆 **No hay envíos registrados.** Usa el panel lateral para crear envíos o generar datos de ejemplo.")
     
     # Mostrar demo visual
@@ -627,8 +695,17 @@ if df.empty:
     with col3:
         st.metric("Valor Total", "$0", "Sin carga")
     
+    record_run(_run_start)
     st.stop()
 
+# Plotly se importa sólo cuando hay envíos que graficar (el arranque sin datos no lo carga)
+import plotly.graph_objects as go
+import plotly.express as px
+from plotly.subplots import make_subplots
+from figures import compact_figure, route_map_traces, sample_rows, top_rows
+
+df = st.session_state.shipments_data.to_frame()
+
 # Agregar predicción
 df["Predicción_Desabasto"], df["Indicador"] = zip(*df.apply(
     lambda row: predict_stockout_risk(
@@ -639,6 +716,23 @@ df["Predicción_Desabasto"], df["Indicador"] = zip(*df.apply(
     ), axis=1
 ))
 
+# Vista filtrada: se resuelve una vez por ejecución con los índices de la flota y la
+# comparten el mapa, la tabla y los conteos
+if st.session_state.get("fleet_index") is None or st.session_state.fleet_index.store is not st.session_state.shipments_data:
+    st.session_state.fleet_index = FleetIndex(st.session_state.shipments_data)
+fleet_filter = FleetFilter(
+    statuses=None if status_filter == "Todos" else [status_filter],
+    origins=origin_filter or None,
+    destinations=destination_filter or None,
+    cargos=cargo_filter or None,
+    # El extremo superior del slider de valor queda abierto
+    value_range=None if value_filter == (0, 1_000_000) else (value_filter[0], value_filter[1] if value_filter[1] < 1_000_000 else np.inf),
+    risk_range=None if risk_filter == (0, 100) else risk_filter,
+    # ETA en días epoch, igual que la columna interna eta_day
+    eta_range=tuple(day.toordinal() - EPOCH_ORDINAL for day in eta_filter) if len(eta_filter) == 2 else None,
+)
+df_view = df.iloc[st.session_state.fleet_index.select(fleet_filter)] if fleet_filter.active else df
+
 # ============================================
 # MÉTRICAS PRINCIPALES MEJORADAS
 # ============================================
@@ -671,6 +765,22 @@ with col5:
 
 st.markdown("---")
 
+# ============================================
+# ALERTAS
+# ============================================
+
+if st.session_state.alert_log:
+    with st.expander(f"🚨 Alertas ({len(new_alerts)} nuevas)", expanded=bool(new_alerts)):
+        alert_df = pd.DataFrame(st.session_state.alert_log)
+        st.dataframe(
+            alert_df[["timestamp", "severity", "rule", "message"]].rename(columns={
+                "timestamp": "Fecha", "severity": "Severidad", "rule": "Regla", "message": "Detalle"
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.caption(f"Registradas en {ALERTS_LOG_PATH} | Payloads webhook en cola: {len(st.session_state.alert_webhook.outbox)}")
+
 # ============================================
 # MAPA AVANZADO
 # ============================================
@@ -695,14 +805,30 @@ with col2:
     """)
     
     # Info adicional
-    if status_filter != "Todos":
-        filtered_count = len(df[df["Estado"] == status_filter])
-        st.metric(f"Envíos {status_filter}", filtered_count)
+    if fleet_filter.active:
+        st.metric("Envíos filtrados", len(df_view))
 
 with col1:
-    route_map = create_advanced_route_map(df, status_filter, show_vessels)
+    route_map = create_advanced_route_map(df_view, show_vessels)
     if route_map:
-        st.plotly_chart(route_map, use_container_width=True)
+        st.plotly_chart(compact_figure(route_map), use_container_width=True)
+
+with st.expander("⚓ Colas de Atraque por Puerto"):
+    port_backlog = backlog_frame(st.session_state.shipments_data)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("⏳ Espera Promedio", f"{df['Espera_Puerto'].mean():.1f} días")
+    with col2:
+        st.metric("🚢 Envíos con Espera", int((df['Espera_Puerto'] > 0).sum()))
+    with col3:
+        st.metric("⚓ Cola Máxima", f"{int(port_backlog.to_numpy().max())} buques")
+    fig_queue = px.line(port_backlog, title="Buques en Espera por Puerto Destino", labels={"value": "Buques", "variable": "Puerto"})
+    fig_queue.update_layout(height=300, paper_bgcolor='rgba(255,255,255,0.95)')
+    st.plotly_chart(compact_figure(fig_queue), use_container_width=True)
+    st.caption("Capacidad de atraque por puerto (buques/día): " + ", ".join(
+        f"{name.split(',')[0]}: {capacity}"
+        for name, capacity in zip(DESTINATION_PORTS, fleet_berth_capacity(st.session_state.shipments_data))
+    ))
 
 st.markdown("---")
 
@@ -716,10 +842,44 @@ critical_inventory = df.nsmallest(4, 'Días_Stock_Cero')
 
 if not critical_inventory.empty:
     gauge_chart = create_inventory_gauge(critical_inventory)
-    st.plotly_chart(gauge_chart, use_container_width=True)
+    st.plotly_chart(compact_figure(gauge_chart), use_container_width=True)
     
     st.caption("*Los gauges muestran días de stock disponible vs. días de tránsito restantes. La línea roja indica el ETA.*")
 
+with st.expander("🧮 Recomendaciones de Reabastecimiento y Expedición"):
+    col1, col2 = st.columns(2)
+    with col1:
+        expedite_slots = st.number_input("🚀 Envíos a expeditar por puerto", 0, 50, DEFAULT_EXPEDITE_SLOTS, 1)
+    with col2:
+        expedite_days = st.number_input("⏩ Días recuperados al expeditar", 1, 20, DEFAULT_EXPEDITE_DAYS, 1)
+
+    plan_placeholder = st.empty()
+    port_plans = []
+    for port, plan in iter_replenishment_plan(
+        df,
+        stockout_buffer=stockout_buffer,
+        expedite_slots=expedite_slots,
+        expedite_days=expedite_days,
+        time_budget_s=2.0
+    ):
+        port_plans.append(plan)
+        plan_placeholder.caption(f"Puertos optimizados: {len(port_plans)} (último: {port})")
+
+    replenishment = pd.concat(port_plans, ignore_index=True)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("📉 Días sin stock (actual)", f"{replenishment['Días_Sin_Stock'].sum():,.1f}")
+    with col2:
+        st.metric("📈 Días sin stock (con plan)", f"{replenishment['Días_Sin_Stock_Post'].sum():,.1f}")
+    with col3:
+        st.metric("🚀 Envíos a expeditar", int(replenishment['Expeditar'].sum()))
+
+    st.dataframe(
+        replenishment.sort_values(["Expeditar", "Días_Sin_Stock"], ascending=False),
+        use_container_width=True,
+        height=300
+    )
+
 st.markdown("---")
 
 # ============================================
@@ -728,13 +888,13 @@ st.markdown("---")
 
 st.subheader("📊 Análisis Multidimensional de Riesgos")
 
-tab1, tab2, tab3, tab4 = st.tabs(["📈 Timeline Riesgos", "🎲 Análisis 3D", "💰 Valor en Riesgo", "📉 Distribuciones"])
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["📈 Timeline Riesgos", "🎲 Análisis 3D", "💰 Valor en Riesgo", "📉 Distribuciones", "🧪 Escenarios What-If"])
 
 with tab1:
     col1, col2 = st.columns([2, 1])
     with col1:
         risk_timeline = create_risk_timeline(df)
-        st.plotly_chart(risk_timeline, use_container_width=True)
+        st.plotly_chart(compact_figure(risk_timeline), use_container_width=True)
     
     with col2:
         st.markdown("### 🎯 Top 5 Riesgos")
@@ -751,13 +911,13 @@ with tab1:
 
 with tab2:
     scatter_3d = create_3d_risk_scatter(df)
-    st.plotly_chart(scatter_3d, use_container_width=True)
+    st.plotly_chart(compact_figure(scatter_3d), use_container_width=True)
     
     st.info("🔍 **Interpretación:** Cada punto representa un envío. El tamaño y color indican el nivel de riesgo total. Rota el gráfico con el mouse.")
 
 with tab3:
     value_risk = create_value_at_risk_chart(df)
-    st.plotly_chart(value_risk, use_container_width=True)
+    st.plotly_chart(compact_figure(value_risk), use_container_width=True)
     
     total_at_risk = (df['Valor_Carga_USD'] * (df['Score_Riesgo'] / 100)).sum()
     col1, col2, col3 = st.columns(3)
@@ -788,19 +948,69 @@ with tab4:
             title="Histograma de Scores de Riesgo"
         )
         fig_hist.update_layout(height=350, paper_bgcolor='rgba(255,255,255,0.95)')
-        st.plotly_chart(fig_hist, use_container_width=True)
+        st.plotly_chart(compact_figure(fig_hist), use_container_width=True)
     
     with col2:
         st.markdown("**Distribución por Tipo de Carga**")
+        # Pre-agregado por tipo: el gráfico es el mismo y viaja una fila por tipo, no por envío
         fig_pie = px.pie(
-            df,
+            df.groupby("Tipo_Carga", as_index=False)["Valor_Carga_USD"].sum(),
             names="Tipo_Carga",
             values="Valor_Carga_USD",
             title="Valor por Tipo de Carga",
             hole=0.4
         )
         fig_pie.update_layout(height=350, paper_bgcolor='rgba(255,255,255,0.95)')
-        st.plotly_chart(fig_pie, use_container_width=True)
+        st.plotly_chart(compact_figure(fig_pie), use_container_width=True)
+
+with tab5:
+    st.markdown("**Comparación de pesos, umbrales y buffer sobre toda la flota**")
+    weight_presets = {
+        "Base (30/50/20)": DEFAULT_WEIGHTS,
+        "Clima dominante": (0.5, 0.3, 0.2),
+        "Congestión dominante": (0.2, 0.7, 0.1),
+        "Social dominante": (0.2, 0.3, 0.5),
+    }
+    scenario_grid = build_scenario_grid(
+        weights=list(weight_presets.values()),
+        thresholds=[DEFAULT_THRESHOLDS, (DEFAULT_THRESHOLDS[0], risk_threshold)],
+        stockout_buffers=[stockout_buffer, stockout_buffer + 5],
+    )
+    # El barrido corre en el pool de procesos: con las mismas entradas el ejecutor devuelve
+    # el resultado cacheado (o el trabajo en curso, que puede compartir otra sesión, por eso
+    # no se cancela al cambiar los parámetros) sin recalcular
+    executor = get_job_executor()
+    st.session_state.scenario_job = executor.submit(
+        scenario_sweep_block,
+        {**fleet_arrays(df), **scenario_grid},
+        combine_frames,
+        n_chunks=min(executor.max_workers, len(scenario_grid["weights"]))
+    )
+    st.session_state.scenario_polling = not st.session_state.scenario_job.done()
+    st.fragment(show_scenario_job, run_every=1 if st.session_state.scenario_polling else None)(
+        scenario_grid, list(weight_presets.keys())
+    )
+
+    st.markdown("---")
+    st.markdown("**🎲 Simulación Monte Carlo de Factores de Riesgo (en segundo plano)**")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        mc_samples = st.number_input("Muestras", 100, 20000, 1000, 100)
+    with col2:
+        mc_noise = st.slider("Ruido de factores (σ)", 1, 30, 10, 1)
+    with col3:
+        if st.button("▶️ Lanzar simulación", use_container_width=True):
+            st.session_state.mc_job = get_job_executor().submit(
+                monte_carlo_block,
+                fleet_arrays(df),
+                combine_frames,
+                {"n_samples": mc_samples, "noise_std": float(mc_noise)}
+            )
+
+    if st.session_state.get("mc_job") is not None:
+        # Mientras corre, sólo este fragmento se refresca cada segundo
+        st.session_state.mc_polling = not st.session_state.mc_job.done()
+        st.fragment(show_monte_carlo_job, run_every=1 if st.session_state.mc_polling else None)()
 
 st.markdown("---")
 
@@ -810,19 +1020,13 @@ st.markdown("---")
 
 st.subheader("📋 Tabla Detallada de Envíos")
 
-# Filtrar datos
-if status_filter != "Todos":
-    df_display = df[df["Estado"] == status_filter]
-else:
-    df_display = df
-
-df_display = df_display.sort_values("Score_Riesgo", ascending=False)
+df_display = df_view.sort_values("Score_Riesgo", ascending=False)
 
 # Selector de columnas
 all_columns = df_display.columns.tolist()
 default_cols = [
     "Indicador", "ID", "Vessel_ID", "Origen", "Destino", "Estado",
-    "Tipo_Carga", "Valor_Carga_USD", "Tránsito_Total", "Días_Transcurridos",
+    "Tipo_Carga", "Valor_Carga_USD", "Tránsito_Total", "Espera_Puerto", "Días_Transcurridos",
     "ETA", "Inventario_Actual", "Días_Stock_Cero", "Score_Riesgo",
     "Velocidad_Nudos", "Distancia_Restante_NM"
 ]
@@ -879,7 +1083,7 @@ with col1:
                ]}
     ))
     fig_climate.update_layout(height=200, margin=dict(l=20, r=20, t=20, b=20))
-    st.plotly_chart(fig_climate, use_container_width=True)
+    st.plotly_chart(compact_figure(fig_climate), use_container_width=True)
 
 with col2:
     st.markdown("**🚧 Congestión Portuaria**")
@@ -900,7 +1104,7 @@ with col2:
                ]}
     ))
     fig_congestion.update_layout(height=200, margin=dict(l=20, r=20, t=20, b=20))
-    st.plotly_chart(fig_congestion, use_container_width=True)
+    st.plotly_chart(compact_figure(fig_congestion), use_container_width=True)
 
 with col3:
     st.markdown("**⚡ Inestabilidad Social**")
@@ -921,7 +1125,7 @@ with col3:
                ]}
     ))
     fig_stability.update_layout(height=200, margin=dict(l=20, r=20, t=20, b=20))
-    st.plotly_chart(fig_stability, use_container_width=True)
+    st.plotly_chart(compact_figure(fig_stability), use_container_width=True)
 
 st.markdown("---")
 
@@ -942,12 +1146,66 @@ fig_heatmap = px.imshow(
     title="Correlación entre Variables"
 )
 fig_heatmap.update_layout(height=400, paper_bgcolor='rgba(255,255,255,0.95)')
-st.plotly_chart(fig_heatmap, use_container_width=True)
+st.plotly_chart(compact_figure(fig_heatmap), use_container_width=True)
+
+# ============================================
+# HISTÓRICO DE LA FLOTA
+# ============================================
+
+st.markdown("---")
+st.subheader("🕰️ Histórico de la Flota")
+
+history = st.session_state.history
+status_history = history.range_summary(by="status")
+
+if len(history) < 2:
+    st.info("El histórico se construye con cada cambio de la flota (nuevos envíos, recálculos). Aún no hay suficientes snapshots.")
+else:
+    fig_history = px.line(
+        status_history,
+        color_discrete_map={
+            "CRÍTICO": "#FF0000",
+            "ALTO RIESGO": "#FF8C00",
+            "RIESGO MEDIO": "#FFD700",
+            "NORMAL": "#00FF00"
+        },
+        title="Envíos por Estado en el Tiempo",
+        markers=True
+    )
+    fig_history.update_layout(height=350, paper_bgcolor='rgba(255,255,255,0.95)', yaxis_title="Envíos")
+    st.plotly_chart(compact_figure(fig_history), use_container_width=True)
+
+    as_of_time = st.select_slider(
+        "📅 Ver estado al momento",
+        options=history.timestamps,
+        value=history.timestamps[-1],
+        format_func=lambda t: t.strftime("%Y-%m-%d %H:%M:%S")
+    )
+    as_of_summary = history.summary_as_of(as_of_time)
+    as_of_value = history.summary_as_of(as_of_time, metric="value_at_risk")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("🔴 Críticos", int(as_of_summary["CRÍTICO"]))
+    with col2:
+        st.metric("🟠 Alto Riesgo", int(as_of_summary["ALTO RIESGO"]))
+    with col3:
+        st.metric("🚢 Envíos", int(as_of_summary.sum()))
+    with col4:
+        st.metric("⚠️ Valor en Riesgo", f"${as_of_value.sum():,.0f}")
+
+    with st.expander("Valor en riesgo por ruta en el tiempo"):
+        lane_history = history.range_summary(by="lane", metric="value_at_risk")
+        st.dataframe(
+            lane_history.loc[:, lane_history.any()].style.format("${:,.0f}"),
+            use_container_width=True
+        )
 
 # ============================================
 # FOOTER
 # ============================================
 
+startup_timings = record_run(_run_start)
+
 st.markdown("---")
 st.markdown("""
 <div style='text-align: center; padding: 20px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px; color: white;'>
@@ -956,3 +1214,4 @@ st.markdown("""
     <p><i>Datos sintéticos generados para demostración - Listo para integración con APIs reales</i></p>
 </div>
 """, unsafe_allow_html=True)
+st.caption(f"⏱️ Arranque en frío: {startup_timings['cold_start_ms']:.0f} ms | Última ejecución: {startup_timings['last_run_ms']:.0f} ms")
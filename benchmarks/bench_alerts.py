@@ -0,0 +1,59 @@
+"""Alertas: 100 reglas sobre 1M de envíos, evaluando sólo las filas cambiadas.
+
+Uso: python benchmarks/bench_alerts.py [n_envíos] [filas_cambiadas_por_tick]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alerts import AlertEngine, FileSink, Rule, WebhookSink
+from fleet import synthetic_store
+from recalculation import recompute_rows
+from risk_engine import STATUS_LABELS
+
+
+def hundred_rules():
+    rules = [Rule(f"Estado {status}", "status", status=status) for status in STATUS_LABELS]
+    rules += [Rule(f"Desabasto buffer {b}", "stockout_margin", buffer=b) for b in range(30)]
+    rules += [Rule(f"Score > {v}", "threshold", column="Score_Riesgo", op=">", value=v) for v in range(40, 70)]
+    rules += [Rule(f"Valor > {v}k", "threshold", column="Valor_Carga_USD", op=">", value=v * 1000)
+              for v in range(100, 500, 13)][:30]
+    rules += [Rule(f"Ruta VaR > {v}M", "lane_value_at_risk", threshold=v * 1e6) for v in (100, 200, 300, 400, 500, 600)]
+    return rules[:100]
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    changed = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    rng = np.random.default_rng(0)
+
+    store = synthetic_store(n)
+    rules = hundred_rules()
+    with tempfile.TemporaryDirectory() as directory:
+        webhook = WebhookSink()
+        engine = AlertEngine(rules, sinks=[FileSink(os.path.join(directory, "alerts.jsonl")), webhook])
+
+        start = time.perf_counter()
+        initial = engine.evaluate(store)
+        print(f"{len(rules)} reglas, evaluación inicial de {n} envíos: "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms ({len(initial)} alertas)")
+
+        latencies = []
+        for _ in range(20):
+            rows = rng.choice(n, changed, replace=False)
+            store.update_rows(rows, {"congestion": rng.integers(0, 101, changed)})
+            recompute_rows(store, rows)
+            start = time.perf_counter()
+            engine.evaluate(store)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        repeat = engine.evaluate(store)
+        print(f"evaluación incremental ({changed} filas cambiadas): "
+              f"p50 {np.median(latencies):.1f} ms, máx {max(latencies):.1f} ms")
+        print(f"sin cambios: {len(repeat)} alertas (deduplicadas); payloads webhook: {len(webhook.outbox)}")
@@ -0,0 +1,38 @@
+"""Arranque en frío del dashboard: primera ejecución del script en un proceso nuevo.
+
+Uso: python benchmarks/bench_cold_start.py [repeticiones]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.run()
+first = (time.perf_counter() - start) * 1000
+print(json.dumps({{"first_run_ms": first, "express_loaded": "plotly.express" in sys.modules}}))
+"""
+
+
+def cold_start(app_path):
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(app=app_path)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    runs = [cold_start(os.path.join(ROOT, "app.py")) for _ in range(repeats)]
+    times = [run["first_run_ms"] for run in runs]
+    print(f"primera ejecución (sesión vacía, incluye importar streamlit): "
+          f"mediana {statistics.median(times):.0f} ms, min {min(times):.0f} ms")
+    print(f"plotly.express cargado sin datos: {runs[0]['express_loaded']}")
@@ -0,0 +1,130 @@
+"""Tamaño del payload de las figuras del dashboard con 10.000 envíos, antes y después de la capa compacta.
+
+"Antes" reproduce las figuras de la app original (línea base): el mapa con cuatro trazas
+por envío y rutas rectas de 2 puntos, y los gráficos por envío completos.
+
+Uso: python benchmarks/bench_figures.py [n_envíos]
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.utils import PlotlyJSONEncoder
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fleet import synthetic_store
+from figures import STATUS_COLORS, compact_figure, route_map_traces, sample_rows, top_rows
+from ports import ORIGIN_INDEX, DESTINATION_INDEX, route_position
+
+
+def legacy_route_map(df, vessel_positions):
+    """Trazas por envío como el mapa original (ruta recta, origen, destino y buque), como dicts"""
+    traces = []
+    for row in df.to_dict("records"):
+        color = STATUS_COLORS[row["Estado"]]
+        traces.append({"type": "scattergeo", "lon": [row["Origin_Lon"], row["Dest_Lon"]],
+                       "lat": [row["Origin_Lat"], row["Dest_Lat"]], "mode": "lines",
+                       "line": {"width": 3, "color": color}, "opacity": 0.7, "hoverinfo": "skip", "showlegend": False})
+        traces.append({"type": "scattergeo", "lon": [row["Origin_Lon"]], "lat": [row["Origin_Lat"]],
+                       "mode": "markers+text", "marker": {"size": 15, "color": "#1E90FF", "symbol": "circle",
+                                                          "line": {"width": 2, "color": "white"}},
+                       "text": row["Origen"].split(",")[0], "textposition": "top center",
+                       "textfont": {"size": 10, "color": "black", "family": "Arial Black"},
+                       "hovertemplate": f"<b>Puerto Origen:</b> {row['Origen']}<br><b>ID Envío:</b> {row['ID']}<extra></extra>",
+                       "showlegend": False})
+        traces.append({"type": "scattergeo", "lon": [row["Dest_Lon"]], "lat": [row["Dest_Lat"]],
+                       "mode": "markers+text", "marker": {"size": 18, "color": color, "symbol": "square",
+                                                          "line": {"width": 2, "color": "white"}},
+                       "text": row["Destino"].split(",")[0], "textposition": "bottom center",
+                       "textfont": {"size": 10, "color": "black", "family": "Arial Black"},
+                       "hovertemplate": f"<b>Puerto Destino:</b> {row['Destino']}<br><b>Estado:</b> {row['Estado']}<br><b>ETA:</b> {row['ETA']}<extra></extra>",
+                       "showlegend": False})
+        position = vessel_positions[row["Vessel_ID"]]
+        traces.append({"type": "scattergeo", "lon": [position["lon"]], "lat": [position["lat"]],
+                       "mode": "markers+text", "marker": {"size": 20, "color": "white", "symbol": "circle",
+                                                          "line": {"width": 3, "color": color}},
+                       "text": "🚢", "textfont": {"size": 20},
+                       "hovertemplate": f"""
+                <b>Vessel ID:</b> {row['Vessel_ID']}<br>
+                <b>Envío:</b> {row['ID']}<br>
+                <b>Progreso:</b> {position['progress']:.1f}%<br>
+                <b>Velocidad:</b> {row['Velocidad_Nudos']} nudos<br>
+                <b>Distancia restante:</b> {row['Distancia_Restante_NM']:.0f} NM<br>
+                <b>Tipo carga:</b> {row['Tipo_Carga']}<br>
+                <b>Valor:</b> ${row['Valor_Carga_USD']:,.0f}<br>
+                <b>Estado:</b> {row['Estado']}<br>
+                <extra></extra>
+                """, "showlegend": False})
+    return {"data": traces, "layout": go.Figure().layout.to_plotly_json()}
+
+
+def per_shipment_figures(df):
+    """Gráficos por envío del dashboard: timeline de score, 3D de factores y valor en riesgo"""
+    df_sorted = df.sort_values("Score_Riesgo")
+    timeline = go.Figure(go.Bar(y=df_sorted["ID"], x=df_sorted["Score_Riesgo"], orientation="h",
+                                marker=dict(color=df_sorted["Estado"].map(STATUS_COLORS)),
+                                text=df_sorted["Score_Riesgo"].round(1),
+                                hovertemplate="<b>%{y}</b><br>Score: %{x:.1f}<extra></extra>"))
+    scatter = go.Figure(go.Scatter3d(x=df["Riesgo_Clima"], y=df["Congestión_Puerto"], z=df["Estabilidad_Social"],
+                                     mode="markers+text", marker=dict(size=df["Score_Riesgo"] / 5, color=df["Score_Riesgo"]),
+                                     text=df["ID"]))
+    value_at_risk = df["Valor_Carga_USD"] * (df["Score_Riesgo"] / 100)
+    bars = go.Figure([go.Bar(x=df["ID"], y=df["Valor_Carga_USD"]), go.Bar(x=df["ID"], y=value_at_risk)])
+    return [timeline, scatter, bars]
+
+
+def shared_figures(df, aggregate=False):
+    """Gráficos agregados; con `aggregate` la torta recibe el total por tipo de carga"""
+    correlation = df[["Riesgo_Clima", "Congestión_Puerto", "Estabilidad_Social", "Score_Riesgo",
+                      "Retraso", "Valor_Carga_USD"]].corr()
+    return [
+        px.histogram(df, x="Score_Riesgo", color="Estado", nbins=20),
+        px.pie(df.groupby("Tipo_Carga", as_index=False)["Valor_Carga_USD"].sum() if aggregate else df,
+               names="Tipo_Carga", values="Valor_Carga_USD"),
+        px.imshow(correlation, text_auto=".2f"),
+    ]
+
+
+def payload(figure):
+    if isinstance(figure, dict):
+        return json.dumps(figure, cls=PlotlyJSONEncoder)
+    return pio.to_json(figure, validate=False)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    df = synthetic_store(n).to_frame()
+    df["Score_Riesgo"] = df["Score_Riesgo"] + np.random.default_rng(0).uniform(-0.04, 0.04, n)
+    progress = np.minimum(df["Días_Transcurridos"] / df["Tránsito_Total"], 1.0).to_numpy()
+    lat, lon = route_position(df["Origen"].map(ORIGIN_INDEX).to_numpy(), df["Destino"].map(DESTINATION_INDEX).to_numpy(), progress)
+    positions = {vessel: {"lat": a, "lon": o, "progress": p * 100}
+                 for vessel, a, o, p in zip(df["Vessel_ID"], lat, lon, progress)}
+
+    start = time.perf_counter()
+    before = [legacy_route_map(df, positions), *per_shipment_figures(df), *shared_figures(df)]
+    before_sizes = [len(payload(figure)) for figure in before]
+    before_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = [
+        go.Figure(route_map_traces(df, positions)),
+        *per_shipment_figures(top_rows(df, "Score_Riesgo"))[:1],
+        *per_shipment_figures(sample_rows(df))[1:2],
+        *per_shipment_figures(top_rows(df, "Valor_Carga_USD"))[2:],
+        *shared_figures(df, aggregate=True),
+    ]
+    after_sizes = [len(payload(compact_figure(figure))) for figure in after]
+    after_s = time.perf_counter() - start
+
+    print("antes: figuras de la app original (línea base) | después: capa compacta")
+    names = ["mapa de rutas", "timeline de score", "3D de factores", "valor en riesgo", "histograma", "torta", "correlación"]
+    for name, old, new in zip(names, before_sizes, after_sizes):
+        print(f"{name:>18}: {old / 1024:9.1f} KiB -> {new / 1024:7.1f} KiB ({old / new:.1f}x)")
+    print(f"{'total':>18}: {sum(before_sizes) / 2**20:9.2f} MiB -> {sum(after_sizes) / 2**20:7.2f} MiB "
+          f"({sum(before_sizes) / sum(after_sizes):.1f}x) | construir + serializar: {before_s:.2f} s -> {after_s:.2f} s")
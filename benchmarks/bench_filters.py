@@ -0,0 +1,65 @@
+"""Filtros combinados por índice frente a escaneos booleanos del DataFrame.
+
+Uso: python benchmarks/bench_filters.py [n_envíos]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fleet import synthetic_store
+from filters import FleetFilter, FleetIndex
+from ports import ORIGIN_NAMES, DESTINATION_NAMES, CARGO_NAMES
+
+
+def best_ms(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times), result
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    store = synthetic_store(n)
+    df = store.to_frame()
+    eta = df["ETA"].astype("datetime64[s]")
+    eta_day = eta.values.astype("datetime64[D]").astype(np.int64)
+    criteria = FleetFilter(
+        statuses=["CRÍTICO", "ALTO RIESGO"],
+        origins=list(ORIGIN_NAMES[:3]),
+        destinations=list(DESTINATION_NAMES[:2]),
+        cargos=list(CARGO_NAMES[:4]),
+        value_range=(100_000, 400_000),
+        eta_range=(int(eta_day.min()) + 5, int(eta_day.max()) - 5),
+        risk_range=(40.0, 90.0),
+    )
+
+    def pandas_scan():
+        mask = (
+            df["Estado"].isin(criteria.statuses)
+            & df["Origen"].isin(criteria.origins)
+            & df["Destino"].isin(criteria.destinations)
+            & df["Tipo_Carga"].isin(criteria.cargos)
+            & df["Valor_Carga_USD"].between(*criteria.value_range)
+            & (eta_day >= criteria.eta_range[0]) & (eta_day <= criteria.eta_range[1])
+            & df["Score_Riesgo"].between(*criteria.risk_range)
+        )
+        return np.flatnonzero(mask.to_numpy())
+
+    index = FleetIndex(store)
+    start = time.perf_counter()
+    index.select(criteria)
+    build_ms = (time.perf_counter() - start) * 1000
+    index_ms, rows = best_ms(lambda: index.select(criteria))
+    scan_ms, expected = best_ms(pandas_scan)
+    assert np.array_equal(rows, expected)
+
+    print(f"{n} envíos, 7 dimensiones: {len(rows)} filas seleccionadas")
+    print(f"construcción de índices (primer uso): {build_ms:.0f} ms")
+    print(f"índices: {index_ms:.1f} ms | escaneo pandas: {scan_ms:.1f} ms ({scan_ms / index_ms:.1f}x)")
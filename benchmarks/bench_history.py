@@ -0,0 +1,59 @@
+"""Histórico: 100 snapshots diarios de una flota con cambios parciales cada día.
+
+Compara el almacenamiento de deltas + checkpoints con guardar copias completas y
+mide consultas as-of y de rango.
+
+Uso: python benchmarks/bench_history.py [n_envíos] [n_snapshots]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fleet import synthetic_store
+from history import SnapshotStore
+from ports import DESTINATION_NAMES
+from recalculation import FleetRecalculator
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    n_snapshots = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    rng = np.random.default_rng(0)
+
+    store = synthetic_store(n)
+    recalculator = FleetRecalculator(store)
+    history = SnapshotStore()
+    day0 = datetime(2026, 1, 1)
+
+    start = time.perf_counter()
+    for day in range(n_snapshots):
+        # Cada día cambia la congestión de un puerto destino (~20% de la flota) y el inventario de ~1%
+        rows = rng.choice(n, n // 100, replace=False)
+        store.update_rows(rows, {"inventory": rng.integers(100, 501, len(rows))})
+        recalculator.update_factors(destination=DESTINATION_NAMES[day % len(DESTINATION_NAMES)],
+                                    congestion=int(rng.integers(0, 101)))
+        history.snapshot(store, day0 + timedelta(days=day))
+    elapsed = time.perf_counter() - start
+
+    full_copies = store.nbytes * n_snapshots
+    print(f"{n_snapshots} snapshots de {n} envíos en {elapsed:.2f} s")
+    print(f"almacenamiento: {history.nbytes / 2**20:.1f} MiB vs {full_copies / 2**20:.1f} MiB "
+          f"en copias completas ({full_copies / history.nbytes:.1f}x menos)")
+
+    start = time.perf_counter()
+    fleet = history.as_of(day0 + timedelta(days=n_snapshots - 2, hours=12))
+    print(f"as-of (reconstrucción completa): {(time.perf_counter() - start) * 1000:.1f} ms, {len(fleet)} envíos")
+
+    start = time.perf_counter()
+    summary = history.summary_as_of(day0 + timedelta(days=n_snapshots // 2))
+    print(f"críticos a mitad de período: {summary['CRÍTICO']} "
+          f"({(time.perf_counter() - start) * 1000:.2f} ms)")
+
+    start = time.perf_counter()
+    lanes = history.range_summary(day0, day0 + timedelta(days=30), by="status_lane", metric="value_at_risk")
+    print(f"rango 30 días por estado y ruta: {lanes.shape} en {(time.perf_counter() - start) * 1000:.1f} ms")
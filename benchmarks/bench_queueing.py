@@ -0,0 +1,54 @@
+"""Colas de atraque: un año de llegadas de 1M de envíos en todos los puertos destino.
+
+Corre dos escenarios sobre la misma flota: la capacidad escalada a las llegadas de la flota
+con la utilización pedida (la del dashboard) y los atraques fijos de `BERTH_CAPACITY`, que
+con esta flota se saturan y quedan acotados por `MAX_PORT_WAIT_DAYS`.
+
+Uso: python benchmarks/bench_queueing.py [n_envíos] [utilización]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fleet import synthetic_store
+from ports import BERTH_CAPACITY
+from queueing import DEFAULT_UTILIZATION, MAX_PORT_WAIT_DAYS, apply_port_queues, fleet_berth_capacity, queue_waits, sea_arrival_days
+from records import ShipmentStore
+
+
+def run(store, capacity, label):
+    columns = store.columns
+    start = time.perf_counter()
+    waits, backlog, _ = queue_waits(columns["destination"], sea_arrival_days(columns), capacity)
+    simulate_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    rows = apply_port_queues(store, capacity)
+    apply_ms = (time.perf_counter() - start) * 1000
+
+    columns = store.columns
+    assert np.array_equal(columns["port_wait"], waits) and waits.max() <= MAX_PORT_WAIT_DAYS
+    print(f"[{label}] {len(waits)} envíos, {backlog.shape[1]} días, capacidad {capacity.tolist()} buques/día")
+    print(f"simulación de colas: {simulate_ms:.0f} ms | aplicar a la flota (retraso/ETA/estado): {apply_ms:.0f} ms")
+    print(f"espera media {waits.mean():.2f} días, p95 {np.percentile(waits, 95):.0f}, máx {waits.max()} "
+          f"| {len(rows)} envíos con espera actualizada | ETA máx {np.datetime64(int(columns['eta_day'].max()), 'D')}")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    utilization = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_UTILIZATION
+    rng = np.random.default_rng(0)
+
+    store = synthetic_store(n)
+    # Creaciones repartidas en un año para que las llegadas cubran ~365 días
+    store.update_rows(np.arange(n), {
+        "created_minute": store.columns["created_minute"] + rng.integers(0, 365, n) * 1440,
+    })
+    columns = store.columns
+
+    run(ShipmentStore.from_columns(columns), fleet_berth_capacity(store, utilization), f"utilización {utilization:.0%}")
+    run(ShipmentStore.from_columns(columns), BERTH_CAPACITY, f"atraques fijos, espera tope {MAX_PORT_WAIT_DAYS} días")
@@ -0,0 +1,33 @@
+"""Actualización de congestión de un puerto destino sobre una flota de 1M de envíos.
+
+Uso: python benchmarks/bench_recalculation.py [n_envíos]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fleet import synthetic_store
+from ports import ORIGIN_NAMES, DESTINATION_NAMES
+from recalculation import FleetRecalculator
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    store = synthetic_store(n)
+    recalculator = FleetRecalculator(store)
+
+    start = time.perf_counter()
+    recalculator.affected_rows(destination=DESTINATION_NAMES[0])
+    print(f"construcción de índices ({n} envíos): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for label, kwargs in [
+        ("congestión, 1 puerto destino", {"destination": DESTINATION_NAMES[1], "congestion": 85}),
+        ("clima, 1 ruta", {"origin": ORIGIN_NAMES[0], "destination": DESTINATION_NAMES[2], "climate": 90}),
+        ("estabilidad, 1 puerto origen", {"origin": ORIGIN_NAMES[3], "stability": 10}),
+    ]:
+        start = time.perf_counter()
+        rows = recalculator.update_factors(**kwargs)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{label}: {len(rows)} envíos recalculados en {elapsed:.1f} ms")
@@ -0,0 +1,99 @@
+"""Memoria por envío: lista de dicts (formato original) vs. ShipmentStore columnar.
+
+Uso: python benchmarks/bench_records.py [n_envíos]
+"""
+import os
+import random
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ports import ORIGIN_PORTS, DESTINATION_PORTS, CARGO_TYPES
+from records import ShipmentStore
+from risk_engine import STATUS_LABELS
+
+
+def legacy_shipment(i, now):
+    """Mismo dict que produce `generate_shipment_data` en app.py"""
+    origin = random.choice(list(ORIGIN_PORTS))
+    destination = random.choice(list(DESTINATION_PORTS))
+    transit_base = random.randint(25, 40)
+    delay = random.randint(0, 15)
+    departure = now - timedelta(days=random.randint(0, 10))
+    days_in_transit = (now - departure).days
+    inventory = random.randint(100, 500)
+    consumption = random.randint(5, 25)
+    return {
+        "ID": f"SHP-{1000 + i}",
+        "Vessel_ID": f"VSL-{random.randint(1000, 9999)}",
+        "Origen": origin,
+        "Destino": destination,
+        "Origin_Lat": ORIGIN_PORTS[origin]["lat"],
+        "Origin_Lon": ORIGIN_PORTS[origin]["lon"],
+        "Dest_Lat": DESTINATION_PORTS[destination]["lat"],
+        "Dest_Lon": DESTINATION_PORTS[destination]["lon"],
+        "Tránsito_Base": transit_base,
+        "Retraso": delay,
+        "Espera_Puerto": 0,
+        "Tránsito_Total": transit_base + delay,
+        "Días_Transcurridos": days_in_transit,
+        "ETA": (now + timedelta(days=transit_base + delay)).strftime("%Y-%m-%d"),
+        "Fecha_Zarpe": departure.strftime("%Y-%m-%d"),
+        "Inventario_Actual": inventory,
+        "Consumo_Diario": consumption,
+        "Días_Stock_Cero": round(inventory / consumption, 1),
+        "Riesgo_Clima": random.randint(0, 100),
+        "Congestión_Puerto": random.randint(0, 100),
+        "Estabilidad_Social": random.randint(0, 100),
+        "Score_Riesgo": round(random.uniform(0, 100), 1),
+        "Estado": random.choice(STATUS_LABELS),
+        "Tipo_Carga": random.choice(CARGO_TYPES),
+        "Valor_Carga_USD": random.randint(50000, 500000),
+        "Velocidad_Nudos": round(random.uniform(12, 18), 1),
+        "Distancia_Restante_NM": round((1 - days_in_transit / (transit_base + delay)) * random.uniform(8000, 12000), 0),
+        "Fecha_Creación": now.strftime("%Y-%m-%d %H:%M"),
+    }
+
+
+def measure(build):
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    random.seed(0)
+    now = datetime.now()
+    source = [legacy_shipment(i, now) for i in range(n)]
+
+    # Copia profunda para medir sólo la lista de dicts (sin strings internados de `source`)
+    legacy, legacy_bytes = measure(lambda: [
+        {key: (value[:len(value) // 2] + value[len(value) // 2:] if isinstance(value, str) else value)
+         for key, value in row.items()}
+        for row in source
+    ])
+
+    def build_store():
+        store = ShipmentStore()
+        for row in source:
+            store.append(row)
+        return store
+
+    store, store_bytes = measure(build_store)
+
+    assert pd.DataFrame(source).equals(store.to_frame()), "el almacén no reproduce el DataFrame original"
+
+    per_legacy = legacy_bytes / n
+    per_store = store_bytes / n
+    print(f"{n} envíos")
+    print(f"  lista de dicts: {per_legacy:8.0f} B/envío -> {per_legacy * 1e6 / 2**20:8.0f} MiB por 1M")
+    print(f"  ShipmentStore:  {per_store:8.0f} B/envío -> {per_store * 1e6 / 2**20:8.0f} MiB por 1M "
+          f"(columnas: {store.nbytes / n:.0f} B/envío)")
+    print(f"  reducción: {per_legacy / per_store:.1f}x")
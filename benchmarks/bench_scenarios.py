@@ -0,0 +1,45 @@
+"""Barrido what-if: 1.000 escenarios sobre 100.000 envíos sintéticos.
+
+Uso: python benchmarks/bench_scenarios.py [n_escenarios] [n_envíos]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenarios import evaluate_scenarios, random_scenario_grid
+
+
+def synthetic_fleet(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Riesgo_Clima": rng.integers(0, 101, n),
+        "Congestión_Puerto": rng.integers(0, 101, n),
+        "Estabilidad_Social": rng.integers(0, 101, n),
+        "Tránsito_Base": rng.integers(25, 41, n),
+        "Espera_Puerto": np.zeros(n, dtype=np.int64),
+        "Inventario_Actual": rng.integers(100, 501, n),
+        "Consumo_Diario": rng.integers(5, 26, n),
+        "Valor_Carga_USD": rng.integers(50000, 500001, n),
+    })
+
+
+if __name__ == "__main__":
+    n_scenarios = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_shipments = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+    fleet = synthetic_fleet(n_shipments)
+    grid = random_scenario_grid(n_scenarios, seed=0)
+
+    start = time.perf_counter()
+    results = evaluate_scenarios(fleet, grid)
+    elapsed = time.perf_counter() - start
+
+    cells = n_scenarios * n_shipments
+    print(f"{n_scenarios} escenarios × {n_shipments} envíos: {elapsed:.2f} s "
+          f"({cells / elapsed / 1e6:.1f} M celdas/s)")
+    print(results.describe().loc[["min", "max"]].T.to_string())
@@ -0,0 +1,56 @@
+"""Flota sintética en ShipmentStore para los benchmarks."""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ports import ORIGIN_NAMES, DESTINATION_NAMES, CARGO_NAMES
+from records import ShipmentStore
+from risk_engine import risk_scores, risk_delays, status_codes
+
+
+def synthetic_store(n, seed=0):
+    rng = np.random.default_rng(seed)
+    climate = rng.integers(0, 101, n)
+    congestion = rng.integers(0, 101, n)
+    stability = rng.integers(0, 101, n)
+    transit_base = rng.integers(25, 41, n)
+    inventory = rng.integers(100, 501, n)
+    consumption = rng.integers(5, 26, n)
+    score = risk_scores(climate, congestion, stability)
+    delay = risk_delays(score)
+    transit_total = transit_base + delay
+    today = int(time.time() // 86400)
+    elapsed = rng.integers(0, 11, n)
+
+    store = ShipmentStore(capacity=n)
+    store.extend_columns({
+        "id_num": np.arange(1000, 1000 + n),
+        "vessel_num": np.arange(1000, 1000 + n),
+        "origin": rng.integers(0, len(ORIGIN_NAMES), n),
+        "destination": rng.integers(0, len(DESTINATION_NAMES), n),
+        "cargo": rng.integers(0, len(CARGO_NAMES), n),
+        "status": status_codes(score, inventory / consumption, transit_total),
+        "transit_base": transit_base,
+        "delay": delay,
+        "port_wait": np.zeros(n, dtype=np.int16),
+        "transit_total": transit_total,
+        "days_elapsed": elapsed,
+        "eta_day": today + transit_total,
+        "departure_day": today - elapsed,
+        "created_minute": np.full(n, today * 1440 + 600),
+        "inventory": inventory,
+        "consumption": consumption,
+        "stock_days_tenths": np.rint(inventory / consumption * 10),
+        "climate": climate,
+        "congestion": congestion,
+        "stability": stability,
+        "risk_tenths": np.rint(score * 10),
+        "cargo_value": rng.integers(50000, 500001, n),
+        "speed_tenths": rng.integers(120, 181, n),
+        "remaining_nm": rng.integers(0, 12000, n),
+    })
+    return store
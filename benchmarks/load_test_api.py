@@ -0,0 +1,125 @@
+"""Prueba de carga del servicio de scoring (api.py) con conexiones keep-alive.
+
+Levanta el servidor (o usa --url), envía lotes columnar desde varios clientes y
+reporta envíos/s. Objetivo documentado: >= 50.000 envíos/s por worker.
+
+Uso: python benchmarks/load_test_api.py --workers 1 --clients 4 --batch 10000 --seconds 10
+"""
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from api import INPUT_FIELDS, parse_batch, score_batch
+
+TARGET_PER_CORE = 50_000
+
+
+def make_body(batch, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = {
+        "Riesgo_Clima": rng.integers(0, 101, batch),
+        "Congestión_Puerto": rng.integers(0, 101, batch),
+        "Estabilidad_Social": rng.integers(0, 101, batch),
+        "Tránsito_Base": rng.integers(25, 41, batch),
+        "Inventario_Actual": rng.integers(100, 501, batch),
+        "Consumo_Diario": rng.integers(5, 26, batch),
+    }
+    return json.dumps({"columns": {field: columns[field].tolist() for field in INPUT_FIELDS}}).encode()
+
+
+def wait_ready(host, port, timeout=20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("El servidor no respondió a /health")
+
+
+def client(host, port, body, batch, stop_at, totals, lock):
+    # Una sola conexión por cliente: todas las peticiones reutilizan el socket (keep-alive)
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+    done = requests = 0
+    while time.perf_counter() < stop_at:
+        conn.request("POST", "/v1/score", body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+        done += batch
+        requests += 1
+    conn.close()
+    with lock:
+        totals["shipments"] += done
+        totals["requests"] += requests
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="servidor ya levantado, p. ej. http://127.0.0.1:8000")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    body = make_body(args.batch)
+
+    # Rendimiento del scoring en proceso (sin HTTP) como referencia
+    payload = json.loads(body)
+    start = time.perf_counter()
+    score_batch(parse_batch(payload))
+    in_process = args.batch / (time.perf_counter() - start)
+    print(f"scoring en proceso (parseo + cálculo): {in_process:,.0f} envíos/s")
+
+    server = None
+    if args.url:
+        parsed = urlparse(args.url)
+        host, port = parsed.hostname, parsed.port or 80
+    else:
+        host, port = "127.0.0.1", args.port
+        server = subprocess.Popen(
+            [sys.executable, "api.py", "--port", str(port), "--workers", str(args.workers)],
+            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+    try:
+        wait_ready(host, port)
+        totals = {"shipments": 0, "requests": 0}
+        lock = threading.Lock()
+        start = time.perf_counter()
+        stop_at = start + args.seconds
+        threads = [
+            threading.Thread(target=client, args=(host, port, body, args.batch, stop_at, totals, lock))
+            for _ in range(args.clients)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    rate = totals["shipments"] / elapsed
+    print(f"{totals['requests']} peticiones, {totals['shipments']:,} envíos en {elapsed:.1f} s")
+    print(f"throughput HTTP: {rate:,.0f} envíos/s ({rate / args.workers:,.0f} por worker; "
+          f"objetivo {TARGET_PER_CORE:,} por core)")
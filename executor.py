@@ -0,0 +1,227 @@
+import contextlib
+import hashlib
+import itertools
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+import types
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Resultados cacheados por hash de entrada (función, parámetros y bytes de los arrays)
+DEFAULT_CACHE_SIZE = 32
+
+# ============================================
+# MEMORIA COMPARTIDA
+# ============================================
+
+def _share_arrays(arrays):
+    """Copia cada array a un bloque de memoria compartida; devuelve (bloques, specs)"""
+    blocks, specs = [], {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        specs[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+def _run_chunk(task, specs, chunk, n_chunks, params):
+    """Punto de entrada en el proceso hijo: adjunta la memoria compartida y ejecuta la tarea"""
+    blocks = {name: shared_memory.SharedMemory(name=spec[0]) for name, spec in specs.items()}
+    try:
+        arrays = {
+            name: np.ndarray(shape, dtype=np.dtype(dtype), buffer=blocks[name].buf)
+            for name, (_, shape, dtype) in specs.items()
+        }
+        result = task(arrays, chunk, n_chunks, **params)
+        # Las vistas no deben sobrevivir al cierre del bloque
+        del arrays
+        return result
+    finally:
+        for block in blocks.values():
+            block.close()
+
+# Serializa los reemplazos de __main__ entre sesiones (cada sesión corre en su propio hilo)
+_MAIN_LOCK = threading.Lock()
+
+@contextlib.contextmanager
+def _isolated_main():
+    """Oculta el script de Streamlit mientras el pool lanza procesos hijos.
+
+    Streamlit instala el script como `__main__` (con `__file__`) y el arranque "spawn" de
+    multiprocessing re-ejecuta ese archivo en cada hijo para reconstruir `__main__`, es
+    decir, el dashboard completo. Las tareas viven en módulos importables, así que los
+    hijos no necesitan `__main__`: sólo se reemplaza durante `pool.submit` (que es donde
+    se lanzan los procesos), bajo `_MAIN_LOCK` para que dos envíos concurrentes no se
+    restauren mutuamente un `__main__` equivocado. Los scripts de otras sesiones no se
+    afectan: ejecutan con sus propios globals y Streamlit reinstala `__main__` en cada rerun.
+    """
+    with _MAIN_LOCK:
+        main = sys.modules["__main__"]
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            yield
+        finally:
+            sys.modules["__main__"] = main
+
+def input_hash(task, arrays, params):
+    """Hash estable de una tarea y sus entradas"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{task.__module__}.{task.__qualname__}".encode())
+    digest.update(pickle.dumps(sorted(params.items()), protocol=4))
+    for name in sorted(arrays):
+        array = np.ascontiguousarray(arrays[name])
+        digest.update(f"{name}:{array.dtype.str}:{array.shape}".encode())
+        digest.update(memoryview(array).cast("B"))
+    return digest.hexdigest()
+
+# ============================================
+# TRABAJOS EN SEGUNDO PLANO
+# ============================================
+
+class Job:
+    """Trabajo dividido en bloques; expone progreso, cancelación y resultado"""
+
+    def __init__(self, job_id, key, n_chunks):
+        self.id = job_id
+        self.key = key
+        self.n_chunks = n_chunks
+        self.error = None
+        self._futures = []
+        self._completed = 0
+        self._cancelled = False
+        self._result = None
+        self._finalizing = False
+        self._done = threading.Event()
+
+    @property
+    def progress(self):
+        return self._completed / self.n_chunks if self.n_chunks else 1.0
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def done(self):
+        return self._done.is_set()
+
+    def cancel(self):
+        """Cancela los bloques pendientes; los que ya corren terminan y se descartan"""
+        self._cancelled = True
+        for future in self._futures:
+            future.cancel()
+
+    def result(self, timeout=None):
+        """Resultado combinado; relanza el error de un bloque y `CancelledError` si se canceló"""
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"El trabajo {self.id} sigue en curso")
+        if self.error is not None:
+            raise self.error
+        if self._cancelled:
+            raise CancelledError(f"El trabajo {self.id} fue cancelado")
+        return self._result
+
+class JobExecutor:
+    """Pool de procesos con entradas en memoria compartida y caché por hash de entrada"""
+
+    def __init__(self, max_workers=None, cache_size=DEFAULT_CACHE_SIZE):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._running = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+    def submit(self, task, arrays, combine, params=None, n_chunks=None):
+        """Lanza `task(arrays, chunk, n_chunks, **params)` en cada bloque y combina con `combine(partes)`.
+
+        `task` y `combine` deben ser funciones de módulo (se envían por pickle a los procesos).
+        """
+        params = dict(params or {})
+        n_chunks = n_chunks or self.max_workers * 4
+        key = input_hash(task, arrays, {**params, "__n_chunks__": n_chunks})
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                job = Job(next(self._ids), key, n_chunks)
+                job._completed = n_chunks
+                job._result = self._cache[key]
+                job._done.set()
+                return job
+            if key in self._running and not self._running[key].cancelled:
+                return self._running[key]
+            job = Job(next(self._ids), key, n_chunks)
+            self._running[key] = job
+
+        blocks, specs = _share_arrays(arrays)
+        parts = [None] * n_chunks
+        try:
+            with _isolated_main():
+                for chunk in range(n_chunks):
+                    job._futures.append(self._pool.submit(_run_chunk, task, specs, chunk, n_chunks, params))
+        except Exception as exc:
+            # Pool roto o cerrado: no quedan bloques de memoria compartida huérfanos
+            job.cancel()
+            for block in blocks:
+                block.close()
+                block.unlink()
+            with self._lock:
+                if self._running.get(key) is job:
+                    del self._running[key]
+            job.error = exc
+            job._done.set()
+            raise
+        # Los callbacks se registran con la lista completa para no finalizar antes de tiempo
+        for chunk, future in enumerate(job._futures):
+            future.add_done_callback(
+                lambda f, chunk=chunk: self._on_chunk_done(job, f, chunk, parts, blocks, combine)
+            )
+        return job
+
+    def _on_chunk_done(self, job, future, chunk, parts, blocks, combine):
+        with self._lock:
+            if not future.cancelled():
+                if future.exception() is not None and job.error is None:
+                    job.error = future.exception()
+                    job.cancel()
+                elif future.exception() is None:
+                    parts[chunk] = future.result()
+                    job._completed += 1
+            if job._finalizing or not all(f.done() for f in job._futures):
+                return
+            job._finalizing = True
+            # Un trabajo cancelado puede haber sido reemplazado por otro con la misma clave
+            if self._running.get(job.key) is job:
+                del self._running[job.key]
+
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+        if job.error is None and not job.cancelled:
+            try:
+                job._result = combine(parts)
+            except Exception as exc:
+                job.error = exc
+            else:
+                with self._lock:
+                    self._cache[job.key] = job._result
+                    while len(self._cache) > self._cache_size:
+                        self._cache.popitem(last=False)
+        job._done.set()
+
+    def shutdown(self):
+        for job in list(self._running.values()):
+            job.cancel()
+        self._pool.shutdown(wait=True, cancel_futures=True)
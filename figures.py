@@ -0,0 +1,218 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from ports import (
+    ORIGIN_INDEX, DESTINATION_INDEX, ORIGIN_NAMES, DESTINATION_NAMES,
+    ORIGIN_LAT, ORIGIN_LON, DESTINATION_LAT, DESTINATION_LON, ROUTE_LAT, ROUTE_LON,
+)
+from risk_engine import STATUS_LABELS
+
+# Decimales que realmente se muestran (ejes, hovers); el resto es ruido en el payload
+COORDINATE_DECIMALS = 3
+DEFAULT_DECIMALS = 2
+
+# Atributos numéricos por punto que se cuantizan (en la traza y en `marker`)
+POINT_ATTRIBUTES = ("x", "y", "z", "lat", "lon", "values", "customdata")
+MARKER_ATTRIBUTES = ("size", "color")
+
+# Límites de puntos para gráficos por envío: barras (top-k) y nubes de puntos (muestreo)
+MAX_BARS = 100
+MAX_SCATTER_POINTS = 2000
+
+STATUS_COLORS = {
+    "CRÍTICO": "#FF0000",
+    "ALTO RIESGO": "#FF8C00",
+    "RIESGO MEDIO": "#FFD700",
+    "NORMAL": "#00FF00"
+}
+
+# ============================================
+# CUANTIZACIÓN Y ARRAYS TIPADOS
+# ============================================
+
+def quantize(values, decimals=DEFAULT_DECIMALS):
+    """Array numérico redondeado a `decimals` en el tipo más chico que lo representa.
+
+    Plotly serializa los arrays numpy como arrays tipados en base64 (`bdata`) en lugar de
+    listas JSON, así que el tipo determina el tamaño. Devuelve `None` si no es numérico.
+    """
+    array = np.asarray(values)
+    if array.dtype.kind not in "biuf" or array.size == 0:
+        return None
+    if array.dtype.kind == "b":
+        return array.astype(np.uint8)
+    if array.dtype.kind == "f":
+        finite = np.isfinite(array)
+        if not finite.all() or not np.array_equal(array, np.round(array)):
+            rounded = np.round(array, decimals)
+            # float32 conserva `decimals` mientras |x| * 10^decimals < 2^24; en tablas 2D
+            # (customdata) las columnas enteras sólo necesitan |x| < 2^24
+            magnitude = np.where(finite, np.abs(rounded), 0)
+            integral = np.all(np.where(finite, rounded == np.round(rounded), True), axis=0)
+            scale = np.where(integral, 1, 10**decimals)
+            fits = np.all(magnitude.max(axis=0, initial=0) * scale < 2**24)
+            return rounded.astype(np.float32 if fits else np.float64)
+    low, high = array.min(), array.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+            return array.astype(dtype)
+    return array.astype(np.float64)
+
+def _prune_template(fig):
+    """Deja en la plantilla sólo los estilos de los tipos de traza que usa la figura"""
+    template = fig.layout.template
+    used = {trace.type for trace in fig.data}
+    fig.layout.template = go.layout.Template(
+        layout=template.layout,
+        data={name: getattr(template.data, name) for name in used if getattr(template.data, name, None)},
+    )
+
+def compact_figure(fig):
+    """Cuantiza los arrays numéricos de cada traza y poda la plantilla (modifica `fig`)"""
+    for trace in fig.data:
+        for name in POINT_ATTRIBUTES:
+            value = getattr(trace, name, None)
+            if value is None or np.ndim(value) == 0:
+                continue
+            decimals = COORDINATE_DECIMALS if name in ("lat", "lon") else DEFAULT_DECIMALS
+            compact = quantize(value, decimals)
+            if compact is not None:
+                trace[name] = compact
+        marker = getattr(trace, "marker", None)
+        for name in MARKER_ATTRIBUTES:
+            value = getattr(marker, name, None) if marker is not None else None
+            if value is None or np.ndim(value) == 0:
+                continue
+            compact = quantize(value)
+            if compact is not None:
+                marker[name] = compact
+    _prune_template(fig)
+    return fig
+
+# ============================================
+# DIEZMADO DE GRÁFICOS POR ENVÍO
+# ============================================
+
+def top_rows(df, column, limit=MAX_BARS):
+    """Las `limit` filas con mayor `column` (todas si hay menos)"""
+    return df if len(df) <= limit else df.nlargest(limit, column)
+
+def sample_rows(df, limit=MAX_SCATTER_POINTS):
+    """Muestra equiespaciada de `limit` filas (todas si hay menos), en el orden original"""
+    if len(df) <= limit:
+        return df
+    return df.iloc[np.linspace(0, len(df) - 1, limit).astype(np.int64)]
+
+# ============================================
+# MAPA DE RUTAS (POCAS TRAZAS)
+# ============================================
+
+# Hover de buques: customdata numérico (array tipado), carga en `hovertext`, estado fijo por traza
+VESSEL_HOVER = (
+    "<b>Vessel ID:</b> VSL-%{customdata[0]:d}<br>"
+    "<b>Envío:</b> SHP-%{customdata[1]:d}<br>"
+    "<b>Progreso:</b> %{customdata[2]:.1f}%<br>"
+    "<b>Velocidad:</b> %{customdata[3]:.1f} nudos<br>"
+    "<b>Distancia restante:</b> %{customdata[4]:.0f} NM<br>"
+    "<b>Tipo carga:</b> %{hovertext}<br>"
+    "<b>Valor:</b> $%{customdata[5]:,.0f}<br>"
+    "<b>Estado:</b> {status}<br>"
+    "<extra></extra>"
+)
+
+def _lane_polylines(origin_codes, destination_codes):
+    """Polilíneas de las rutas distintas concatenadas y separadas por NaN (una sola traza)"""
+    lanes = sorted(set(zip(origin_codes, destination_codes)))
+    gap = np.array([np.nan])
+    lat = np.concatenate([part for o, d in lanes for part in (ROUTE_LAT[o, d], gap)])
+    lon = np.concatenate([part for o, d in lanes for part in (ROUTE_LON[o, d], gap)])
+    return lat, lon
+
+def route_map_traces(df, vessel_positions, show_vessels=True):
+    """Trazas del mapa de rutas: una por estado para rutas y buques, una por tipo de puerto.
+
+    Las rutas repetidas se dibujan una vez, cada puerto lleva un solo marcador y los hovers
+    usan una plantilla compartida con los datos por punto en `customdata`.
+    """
+    origin_codes = df["Origen"].map(ORIGIN_INDEX).to_numpy()
+    destination_codes = df["Destino"].map(DESTINATION_INDEX).to_numpy()
+    status_codes = df["Estado"].map(STATUS_LABELS.index).to_numpy()
+    traces = []
+
+    for code, label in enumerate(STATUS_LABELS):
+        rows = status_codes == code
+        if not rows.any():
+            continue
+        lat, lon = _lane_polylines(origin_codes[rows], destination_codes[rows])
+        traces.append(go.Scattergeo(
+            lon=lon, lat=lat, mode='lines',
+            line=dict(width=3, color=STATUS_COLORS[label]),
+            opacity=0.7, hoverinfo='skip', showlegend=False
+        ))
+
+    # Puerto origen: un marcador por puerto con la cantidad de envíos
+    origins, origin_counts = np.unique(origin_codes, return_counts=True)
+    traces.append(go.Scattergeo(
+        lon=ORIGIN_LON[origins], lat=ORIGIN_LAT[origins],
+        mode='markers+text',
+        marker=dict(size=15, color='#1E90FF', symbol='circle', line=dict(width=2, color='white')),
+        text=[name.split(",")[0] for name in ORIGIN_NAMES[origins]],
+        textposition="top center",
+        textfont=dict(size=10, color='black', family='Arial Black'),
+        customdata=np.column_stack([ORIGIN_NAMES[origins], origin_counts]),
+        hovertemplate="<b>Puerto Origen:</b> %{customdata[0]}<br><b>Envíos:</b> %{customdata[1]}<extra></extra>",
+        showlegend=False
+    ))
+
+    # Puerto destino: color del estado más grave entre sus envíos y la ETA más próxima
+    destinations, destination_counts = np.unique(destination_codes, return_counts=True)
+    worst = np.full(len(DESTINATION_NAMES), len(STATUS_LABELS) - 1)
+    np.minimum.at(worst, destination_codes, status_codes)
+    eta = df["ETA"].to_numpy()
+    next_eta = [eta[destination_codes == code].min() for code in destinations]
+    worst_labels = [STATUS_LABELS[code] for code in worst[destinations]]
+    traces.append(go.Scattergeo(
+        lon=DESTINATION_LON[destinations], lat=DESTINATION_LAT[destinations],
+        mode='markers+text',
+        marker=dict(size=18, color=[STATUS_COLORS[label] for label in worst_labels], symbol='square',
+                    line=dict(width=2, color='white')),
+        text=[name.split(",")[0] for name in DESTINATION_NAMES[destinations]],
+        textposition="bottom center",
+        textfont=dict(size=10, color='black', family='Arial Black'),
+        customdata=np.column_stack([DESTINATION_NAMES[destinations], worst_labels, next_eta, destination_counts]),
+        hovertemplate=(
+            "<b>Puerto Destino:</b> %{customdata[0]}<br><b>Estado:</b> %{customdata[1]}<br>"
+            "<b>ETA:</b> %{customdata[2]}<br><b>Envíos:</b> %{customdata[3]}<extra></extra>"
+        ),
+        showlegend=False
+    ))
+
+    if not show_vessels:
+        return traces
+
+    # Buques en tránsito: una traza por estado (color del borde), hover compartido
+    positions = [vessel_positions.get(vessel) for vessel in df["Vessel_ID"]]
+    known = np.array([position is not None for position in positions], dtype=bool)
+    for code, label in enumerate(STATUS_LABELS):
+        rows = np.flatnonzero(known & (status_codes == code))
+        if len(rows) == 0:
+            continue
+        vessels = df.iloc[rows]
+        points = [positions[row] for row in rows]
+        traces.append(go.Scattergeo(
+            lon=[point["lon"] for point in points],
+            lat=[point["lat"] for point in points],
+            mode='markers+text',
+            marker=dict(size=20, color='white', symbol='circle', line=dict(width=3, color=STATUS_COLORS[label])),
+            text='🚢',
+            textfont=dict(size=20),
+            customdata=np.column_stack([
+                vessels["Vessel_ID"].str[4:].astype(np.int64), vessels["ID"].str[4:].astype(np.int64),
+                np.round([point["progress"] for point in points], 1), vessels["Velocidad_Nudos"],
+                vessels["Distancia_Restante_NM"], vessels["Valor_Carga_USD"],
+            ]),
+            hovertext=vessels["Tipo_Carga"].to_numpy(),
+            hovertemplate=VESSEL_HOVER.replace("{status}", label),
+            showlegend=False
+        ))
+    return traces
@@ -0,0 +1,140 @@
+import numpy as np
+
+from ports import ORIGIN_INDEX, DESTINATION_INDEX, CARGO_INDEX, ORIGIN_NAMES, DESTINATION_NAMES, CARGO_NAMES
+from records import STATUS_INDEX
+from risk_engine import STATUS_LABELS
+
+# Dimensiones categóricas: columna interna, cantidad de códigos y nombre -> código
+CATEGORICAL_DIMENSIONS = {
+    "statuses": ("status", len(STATUS_LABELS), STATUS_INDEX),
+    "origins": ("origin", len(ORIGIN_NAMES), ORIGIN_INDEX),
+    "destinations": ("destination", len(DESTINATION_NAMES), DESTINATION_INDEX),
+    "cargos": ("cargo", len(CARGO_NAMES), CARGO_INDEX),
+}
+
+# Dimensiones de rango: columna interna y escala del valor público (décimas -> x10)
+RANGE_DIMENSIONS = {
+    "value_range": ("cargo_value", 1),
+    "eta_range": ("eta_day", 1),
+    "risk_range": ("risk_tenths", 10),
+}
+
+# ============================================
+# CRITERIOS DE FILTRO
+# ============================================
+
+class FleetFilter:
+    """Criterios combinados (AND entre dimensiones, OR dentro de cada una).
+
+    Categóricas: listas de nombres (`statuses`, `origins`, `destinations`, `cargos`).
+    Rangos cerrados `(min, max)`: `value_range` en USD, `eta_range` en días epoch,
+    `risk_range` en score 0-100. `None` deja la dimensión sin filtrar.
+    """
+
+    def __init__(self, statuses=None, origins=None, destinations=None, cargos=None,
+                 value_range=None, eta_range=None, risk_range=None):
+        self.statuses = statuses
+        self.origins = origins
+        self.destinations = destinations
+        self.cargos = cargos
+        self.value_range = value_range
+        self.eta_range = eta_range
+        self.risk_range = risk_range
+
+    @property
+    def active(self):
+        return any(getattr(self, name) is not None for name in [*CATEGORICAL_DIMENSIONS, *RANGE_DIMENSIONS])
+
+# ============================================
+# ÍNDICES POR DIMENSIÓN
+# ============================================
+
+class FleetIndex:
+    """Índices de la flota para filtros combinados sin recorrer columnas completas.
+
+    Cada valor categórico tiene un bitmap empaquetado (1 bit por envío) y cada dimensión
+    de rango un array ordenado (valores + filas); un rango se resuelve con búsqueda
+    binaria (el bitmap del último rango pedido queda en caché). Los criterios se combinan
+    con AND/OR sobre los bitmaps. Los índices se construyen al primer uso de cada
+    dimensión y se descartan cuando cambia la versión del almacén.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._version = None
+        self._bitmaps = {}
+        self._sorted = {}
+        self._ranges = {}
+
+    def _ensure_version(self):
+        if self._version != (len(self.store), self.store.version):
+            self._bitmaps = {}
+            self._sorted = {}
+            self._ranges = {}
+            self._version = (len(self.store), self.store.version)
+
+    def _category_bitmaps(self, dimension):
+        if dimension not in self._bitmaps:
+            column, n_codes, _ = CATEGORICAL_DIMENSIONS[dimension]
+            codes = self.store.columns[column]
+            self._bitmaps[dimension] = [np.packbits(codes == code) for code in range(n_codes)]
+        return self._bitmaps[dimension]
+
+    def _sorted_index(self, dimension):
+        if dimension not in self._sorted:
+            values = self.store.columns[RANGE_DIMENSIONS[dimension][0]]
+            order = np.argsort(values, kind="stable")
+            self._sorted[dimension] = (values[order], order)
+        return self._sorted[dimension]
+
+    def _range_bitmap(self, dimension, low, high):
+        scale = RANGE_DIMENSIONS[dimension][1]
+        values, order = self._sorted_index(dimension)
+        start = np.searchsorted(values, np.ceil(low * scale - 1e-9), side="left")
+        stop = np.searchsorted(values, np.floor(high * scale + 1e-9), side="right")
+        if start == 0 and stop == len(values):
+            return None
+        # Se guarda el último rango por dimensión: entre reruns los controles casi no cambian
+        cached = self._ranges.get(dimension)
+        if cached is None or cached[0] != (start, stop):
+            mask = np.zeros(len(values), dtype=bool)
+            mask[order[start:stop]] = True
+            cached = ((start, stop), np.packbits(mask))
+            self._ranges[dimension] = cached
+        return cached[1]
+
+    def _category_bitmap(self, dimension, names):
+        lookup = CATEGORICAL_DIMENSIONS[dimension][2]
+        bitmaps = self._category_bitmaps(dimension)
+        codes = {lookup[name] for name in names}
+        if len(codes) == len(bitmaps):
+            return None
+        combined = np.zeros_like(bitmaps[0])
+        for code in codes:
+            combined |= bitmaps[code]
+        return combined
+
+    def select(self, criteria):
+        """Filas (ordenadas) que cumplen todos los criterios de `criteria`"""
+        self._ensure_version()
+        n = len(self.store)
+        if not criteria.active:
+            return np.arange(n)
+
+        result = None
+        for dimension in CATEGORICAL_DIMENSIONS:
+            names = getattr(criteria, dimension)
+            if names is not None:
+                bitmap = self._category_bitmap(dimension, names)
+                if bitmap is not None:
+                    result = bitmap if result is None else result & bitmap
+        for dimension in RANGE_DIMENSIONS:
+            bounds = getattr(criteria, dimension)
+            if bounds is not None:
+                bitmap = self._range_bitmap(dimension, *bounds)
+                if bitmap is not None:
+                    result = bitmap if result is None else result & bitmap
+
+        if result is None:
+            return np.arange(n)
+        return np.flatnonzero(np.unpackbits(result, count=n))
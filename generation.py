@@ -0,0 +1,141 @@
+import threading
+
+import numpy as np
+
+from ports import ORIGIN_NAMES, DESTINATION_NAMES, CARGO_NAMES
+from recalculation import MINUTES_PER_DAY
+from records import SCHEMA
+from risk_engine import risk_scores, risk_delays, status_codes
+
+# Primeros números de ID (SHP-1000, VSL-1000), como en la numeración original
+FIRST_SHIPMENT_ID = 1000
+FIRST_VESSEL_ID = 1000
+
+# Envíos por bloque de generación; cada bloque tiene su propio flujo aleatorio, así el
+# resultado no depende de cuántos procesos se usen
+GENERATION_CHUNK_SIZE = 65_536
+
+# ============================================
+# ASIGNACIÓN DE IDs
+# ============================================
+
+class IdAllocator:
+    """Reserva rangos consecutivos de IDs de envío y de buque, sin repetir nunca un número.
+
+    Los rangos se reservan bajo un lock antes de generar, así lotes concurrentes (hilos o
+    procesos lanzados desde el mismo asignador) no compiten por los mismos IDs.
+    """
+
+    def __init__(self, next_shipment=FIRST_SHIPMENT_ID, next_vessel=FIRST_VESSEL_ID):
+        self.next_shipment = next_shipment
+        self.next_vessel = next_vessel
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_store(cls, store):
+        """Asignador que continúa después de los IDs ya presentes en `store`"""
+        if not store:
+            return cls()
+        columns = store.columns
+        return cls(
+            max(FIRST_SHIPMENT_ID, int(columns["id_num"].max()) + 1),
+            max(FIRST_VESSEL_ID, int(columns["vessel_num"].max()) + 1),
+        )
+
+    def allocate(self, count):
+        """Reserva `count` envíos (un buque por envío); devuelve los primeros IDs del rango"""
+        with self._lock:
+            first = (self.next_shipment, self.next_vessel)
+            self.next_shipment += count
+            self.next_vessel += count
+        return first
+
+# ============================================
+# GENERACIÓN DETERMINISTA POR BLOQUES
+# ============================================
+
+def generate_chunk(seed, first_shipment, first_vessel, chunk, count, now_minute):
+    """Columnas internas de `count` envíos sintéticos del bloque `chunk` de un lote.
+
+    El flujo aleatorio depende sólo de (semilla, primer ID del lote, bloque); mismas
+    distribuciones que `generate_shipment_data` del dashboard.
+    """
+    rng = np.random.default_rng([seed, first_shipment, chunk])
+    offset = chunk * GENERATION_CHUNK_SIZE
+
+    climate = rng.integers(0, 101, count)
+    congestion = rng.integers(0, 101, count)
+    stability = rng.integers(0, 101, count)
+    transit_base = rng.integers(25, 41, count)
+    inventory = rng.integers(100, 501, count)
+    consumption = rng.integers(5, 26, count)
+    elapsed = rng.integers(0, 11, count)
+    score = risk_scores(climate, congestion, stability)
+    delay = risk_delays(score)
+    transit_total = transit_base + delay
+    days_to_zero = inventory / consumption
+    today = now_minute // MINUTES_PER_DAY
+
+    return {
+        "id_num": first_shipment + offset + np.arange(count),
+        "vessel_num": first_vessel + offset + np.arange(count),
+        "origin": rng.integers(0, len(ORIGIN_NAMES), count),
+        "destination": rng.integers(0, len(DESTINATION_NAMES), count),
+        "cargo": rng.integers(0, len(CARGO_NAMES), count),
+        "status": status_codes(score, days_to_zero, transit_total),
+        "transit_base": transit_base,
+        "delay": delay,
+        "port_wait": np.zeros(count, dtype=np.int64),
+        "transit_total": transit_total,
+        "days_elapsed": elapsed,
+        "eta_day": today + transit_total,
+        "departure_day": today - elapsed,
+        "created_minute": np.full(count, now_minute),
+        "inventory": inventory,
+        "consumption": consumption,
+        "stock_days_tenths": np.rint(days_to_zero * 10),
+        "climate": climate,
+        "congestion": congestion,
+        "stability": stability,
+        "risk_tenths": np.rint(score * 10),
+        "cargo_value": rng.integers(50000, 500001, count),
+        "speed_tenths": np.rint(rng.uniform(12, 18, count) * 10),
+        "remaining_nm": np.rint((1 - elapsed / transit_total) * rng.uniform(8000, 12000, count)),
+    }
+
+def _chunk_sizes(n):
+    return [min(GENERATION_CHUNK_SIZE, n - start) for start in range(0, n, GENERATION_CHUNK_SIZE)]
+
+def concat_columns(parts):
+    """Une bloques de columnas internas en orden, con los dtypes del almacén"""
+    parts = [part for part in parts if part]
+    return {
+        name: np.concatenate([part[name] for part in parts]).astype(dtype) if parts else np.zeros(0, dtype=dtype)
+        for name, dtype in SCHEMA.items()
+    }
+
+def generation_block(arrays, chunk, n_chunks, n, seed, first_shipment, first_vessel, now_minute):
+    """Tarea del ejecutor: genera los bloques fijos que le tocan a la porción `chunk`"""
+    sizes = _chunk_sizes(n)
+    start = chunk * len(sizes) // n_chunks
+    stop = (chunk + 1) * len(sizes) // n_chunks
+    return concat_columns([
+        generate_chunk(seed, first_shipment, first_vessel, block, sizes[block], now_minute)
+        for block in range(start, stop)
+    ])
+
+def generate_fleet(n, seed, allocator, now_minute, executor=None):
+    """Genera `n` envíos reproducibles (columnas internas) con IDs reservados en `allocator`.
+
+    Con `executor` (un `JobExecutor`) los bloques se reparten entre procesos; el resultado
+    es idéntico al secuencial para la misma semilla y el mismo rango de IDs.
+    """
+    first_shipment, first_vessel = allocator.allocate(n)
+    params = {
+        "n": n, "seed": seed, "first_shipment": first_shipment,
+        "first_vessel": first_vessel, "now_minute": now_minute,
+    }
+    if executor is None:
+        return generation_block({}, 0, 1, **params)
+    n_chunks = min(executor.max_workers, max(len(_chunk_sizes(n)), 1))
+    return executor.submit(generation_block, {}, concat_columns, params, n_chunks=n_chunks).result()
@@ -0,0 +1,159 @@
+import bisect
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from ports import LANE_LABELS, N_LANES, lane_codes
+from records import ShipmentStore
+from risk_engine import STATUS_LABELS
+
+# Máximo de deltas seguidos antes de forzar una copia completa (acota el costo de as-of)
+DEFAULT_CHECKPOINT_EVERY = 64
+
+def _summarize(columns):
+    """Conteo y valor en riesgo por (estado, ruta): arrays (n_estados, n_rutas)"""
+    cell = columns["status"].astype(np.int64) * N_LANES + lane_codes(columns["origin"], columns["destination"])
+    size = len(STATUS_LABELS) * N_LANES
+    counts = np.bincount(cell, minlength=size)
+    value_at_risk = np.bincount(cell, weights=columns["cargo_value"] * (columns["risk_tenths"] / 1000), minlength=size)
+    shape = (len(STATUS_LABELS), N_LANES)
+    return counts.reshape(shape).astype(np.int64), value_at_risk.reshape(shape)
+
+# ============================================
+# HISTÓRICO DE SNAPSHOTS
+# ============================================
+
+class SnapshotStore:
+    """Histórico append-only del estado de la flota.
+
+    Cada snapshot guarda sólo las celdas que cambiaron respecto del anterior (por columna:
+    filas + valores nuevos) y las filas agregadas. Se guarda una copia completa cuando los
+    deltas acumulados desde la última ya pesan tanto como ella, o tras `checkpoint_every`
+    deltas, así el almacenamiento crece con los cambios y as-of aplica pocos deltas. Los agregados
+    por estado y ruta se calculan al guardar, así las consultas por rango no reconstruyen
+    estados.
+    """
+
+    def __init__(self, checkpoint_every=DEFAULT_CHECKPOINT_EVERY):
+        self.checkpoint_every = checkpoint_every
+        self._times = []
+        self._entries = []
+        self._counts = []
+        self._value_at_risk = []
+        self._last = None
+        self._delta_bytes = 0
+        self._chain = 0
+
+    def __len__(self):
+        return len(self._times)
+
+    @property
+    def timestamps(self):
+        return [datetime.fromtimestamp(t) for t in self._times]
+
+    @property
+    def nbytes(self):
+        total = 0
+        for entry in self._entries:
+            if entry["kind"] == "full":
+                total += sum(array.nbytes for array in entry["columns"].values())
+            else:
+                total += sum(rows.nbytes + values.nbytes for rows, values in entry["changes"].values())
+                total += sum(array.nbytes for array in entry["appended"].values())
+        return total
+
+    def snapshot(self, store, timestamp=None):
+        """Registra el estado actual de `store`; devuelve el tipo de entrada guardada"""
+        timestamp = (timestamp or datetime.now()).timestamp()
+        if self._times and timestamp < self._times[-1]:
+            raise ValueError("Los snapshots deben agregarse en orden cronológico")
+
+        columns = store.columns
+        n = len(store)
+        previous = self._last
+        full_bytes = sum(array.nbytes for array in columns.values())
+        full = (
+            previous is None
+            or n < len(previous["id_num"])
+            or self._chain >= self.checkpoint_every
+            or self._delta_bytes >= full_bytes
+        )
+
+        if full:
+            entry = {"kind": "full", "columns": {name: array.copy() for name, array in columns.items()}}
+        else:
+            n_previous = len(previous["id_num"])
+            changes = {}
+            for name, array in columns.items():
+                changed = np.flatnonzero(array[:n_previous] != previous[name])
+                if len(changed):
+                    changes[name] = (changed.astype(np.int32), array[changed].copy())
+            entry = {
+                "kind": "delta",
+                "changes": changes,
+                "appended": {name: array[n_previous:].copy() for name, array in columns.items()},
+            }
+
+        if full:
+            self._delta_bytes = 0
+            self._chain = 0
+        else:
+            self._delta_bytes += sum(rows.nbytes + values.nbytes for rows, values in entry["changes"].values())
+            self._delta_bytes += sum(array.nbytes for array in entry["appended"].values())
+            self._chain += 1
+
+        counts, value_at_risk = _summarize(columns)
+        self._times.append(timestamp)
+        self._entries.append(entry)
+        self._counts.append(counts)
+        self._value_at_risk.append(value_at_risk)
+        self._last = {name: array.copy() for name, array in columns.items()}
+        return entry["kind"]
+
+    def _index_as_of(self, timestamp):
+        index = bisect.bisect_right(self._times, timestamp.timestamp()) - 1
+        if index < 0:
+            raise LookupError(f"No hay snapshots anteriores a {timestamp:%Y-%m-%d %H:%M}")
+        return index
+
+    def as_of(self, timestamp):
+        """Reconstruye la flota tal como estaba en `timestamp` (último snapshot anterior)"""
+        index = self._index_as_of(timestamp)
+        start = index
+        while self._entries[start]["kind"] != "full":
+            start -= 1
+
+        state = {name: array.copy() for name, array in self._entries[start]["columns"].items()}
+        for entry in self._entries[start + 1:index + 1]:
+            for name, (rows, values) in entry["changes"].items():
+                state[name][rows] = values
+            for name, array in entry["appended"].items():
+                if len(array):
+                    state[name] = np.concatenate([state[name], array])
+        return ShipmentStore.from_columns(state)
+
+    def summary_as_of(self, timestamp, metric="count"):
+        """Conteo (o valor en riesgo) por estado en `timestamp`, sin reconstruir la flota"""
+        index = self._index_as_of(timestamp)
+        values = self._counts[index] if metric == "count" else self._value_at_risk[index]
+        return pd.Series(values.sum(axis=1), index=STATUS_LABELS)
+
+    def range_summary(self, start=None, end=None, by="status", metric="count"):
+        """Serie temporal por estado, ruta o (estado, ruta) entre `start` y `end`"""
+        lo = 0 if start is None else bisect.bisect_left(self._times, start.timestamp())
+        hi = len(self._times) if end is None else bisect.bisect_right(self._times, end.timestamp())
+        if hi <= lo:
+            return pd.DataFrame()
+        source = self._counts if metric == "count" else self._value_at_risk
+        index = pd.DatetimeIndex([datetime.fromtimestamp(t) for t in self._times[lo:hi]], name="Fecha")
+
+        cube = np.stack(source[lo:hi])
+        if by == "status":
+            return pd.DataFrame(cube.sum(axis=2), index=index, columns=STATUS_LABELS)
+        if by == "lane":
+            return pd.DataFrame(cube.sum(axis=1), index=index, columns=LANE_LABELS)
+        if by == "status_lane":
+            columns = pd.MultiIndex.from_product([STATUS_LABELS, LANE_LABELS], names=["Estado", "Ruta"])
+            return pd.DataFrame(cube.reshape(len(index), -1), index=index, columns=columns)
+        raise ValueError("by debe ser 'status', 'lane' o 'status_lane'")
@@ -0,0 +1,81 @@
+import numpy as np
+
+# ============================================
+# TABLAS DE PUERTOS Y TIPOS DE CARGA
+# ============================================
+
+ORIGIN_PORTS = {
+    "Ningbo, China": {"lat": 29.8683, "lon": 121.5440, "code": "CNNGB"},
+    "Shanghai, China": {"lat": 31.2304, "lon": 121.4737, "code": "CNSHA"},
+    "Busan, Corea del Sur": {"lat": 35.1796, "lon": 129.0756, "code": "KRPUS"},
+    "Singapur": {"lat": 1.3521, "lon": 103.8198, "code": "SGSIN"},
+    "Hong Kong": {"lat": 22.3193, "lon": 114.1694, "code": "HKHKG"},
+    "Shenzhen, China": {"lat": 22.5431, "lon": 114.0579, "code": "CNSZX"}
+}
+
+DESTINATION_PORTS = {
+    "Puerto Caucedo, RD": {"lat": 18.4264, "lon": -69.6618, "code": "DOCAU", "berths": 2},
+    "Puerto de Balboa, Panamá": {"lat": 8.9517, "lon": -79.5671, "code": "PABLB", "berths": 4},
+    "Puerto de Colón, Panamá": {"lat": 9.3592, "lon": -79.9009, "code": "PAONX", "berths": 3},
+    "Puerto de Cartagena, Colombia": {"lat": 10.3932, "lon": -75.5144, "code": "COCTG", "berths": 3},
+    "Puerto de Veracruz, México": {"lat": 19.2006, "lon": -96.1429, "code": "MXVER", "berths": 2}
+}
+
+# Tipos de carga
+CARGO_TYPES = ["Electrónicos", "Textiles", "Maquinaria", "Alimentos", "Químicos", "Automotriz"]
+
+# ============================================
+# ÍNDICES NUMÉRICOS (código = posición en la tabla)
+# ============================================
+
+ORIGIN_NAMES = np.array(list(ORIGIN_PORTS), dtype=object)
+DESTINATION_NAMES = np.array(list(DESTINATION_PORTS), dtype=object)
+CARGO_NAMES = np.array(CARGO_TYPES, dtype=object)
+
+ORIGIN_INDEX = {name: code for code, name in enumerate(ORIGIN_PORTS)}
+DESTINATION_INDEX = {name: code for code, name in enumerate(DESTINATION_PORTS)}
+CARGO_INDEX = {name: code for code, name in enumerate(CARGO_TYPES)}
+
+# Rutas (origen, destino) codificadas como origen * n_destinos + destino
+N_LANES = len(ORIGIN_PORTS) * len(DESTINATION_PORTS)
+LANE_LABELS = [
+    f"{origin.split(',')[0]} → {destination.split(',')[0]}"
+    for origin in ORIGIN_PORTS for destination in DESTINATION_PORTS
+]
+
+def lane_codes(origin_codes, destination_codes):
+    return np.asarray(origin_codes, dtype=np.int64) * len(DESTINATION_PORTS) + destination_codes
+
+ORIGIN_LAT = np.array([port["lat"] for port in ORIGIN_PORTS.values()])
+ORIGIN_LON = np.array([port["lon"] for port in ORIGIN_PORTS.values()])
+DESTINATION_LAT = np.array([port["lat"] for port in DESTINATION_PORTS.values()])
+DESTINATION_LON = np.array([port["lon"] for port in DESTINATION_PORTS.values()])
+
+# Atraques disponibles para la flota propia por puerto destino (buques atendidos por día);
+# es el mínimo: `queueing.berth_capacity` lo escala con las llegadas de la flota
+BERTH_CAPACITY = np.array([port["berths"] for port in DESTINATION_PORTS.values()], dtype=np.int64)
+
+# ============================================
+# GEOMETRÍA DE RUTAS (PRECALCULADA AL IMPORTAR, UNA VEZ POR PROCESO)
+# ============================================
+
+# Puntos por ruta dibujada (origen y destino: la línea recta del mapa original) y amplitud
+# (grados de latitud) del arco que siguen los barcos sobre ella
+ROUTE_POINTS = 2
+ROUTE_ARC_DEGREES = 2
+
+def route_position(origin_code, destination_code, progress):
+    """Posición sobre la ruta para un avance 0-1 (vectorizado, misma curva que los barcos)"""
+    progress = np.clip(progress, 0.0, 1.0)
+    o_lat, o_lon = ORIGIN_LAT[origin_code], ORIGIN_LON[origin_code]
+    d_lat, d_lon = DESTINATION_LAT[destination_code], DESTINATION_LON[destination_code]
+    lat = o_lat + (d_lat - o_lat) * progress + np.sin(progress * np.pi) * ROUTE_ARC_DEGREES
+    lon = o_lon + (d_lon - o_lon) * progress
+    return lat, lon
+
+# Polilíneas de cada par origen-destino: arrays (n_origen, n_destino, ROUTE_POINTS)
+ROUTE_LAT, ROUTE_LON = route_position(
+    np.arange(len(ORIGIN_PORTS))[:, None, None],
+    np.arange(len(DESTINATION_PORTS))[None, :, None],
+    np.linspace(0, 1, ROUTE_POINTS)[None, None, :],
+)
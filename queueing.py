@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+
+from ports import BERTH_CAPACITY, DESTINATION_NAMES
+from recalculation import MINUTES_PER_DAY, recompute_rows
+
+# Ocupación objetivo de los atraques: la capacidad diaria de cada puerto se escala a la
+# llegada media de la flota dividida por este valor (con utilización >= 1 la cola crece
+# sin límite)
+DEFAULT_UTILIZATION = 0.9
+
+# Espera máxima en rada: un buque que esperaría más se reprograma y se registra con este tope
+# (también mantiene retraso y tránsito total dentro de las columnas int16 del almacén)
+MAX_PORT_WAIT_DAYS = 60
+
+# ============================================
+# COLAS DE ATRAQUE POR PUERTO DESTINO
+# ============================================
+
+def port_day_arrivals(ports, arrival_days, n_ports):
+    """Llegadas por (puerto, día): array (n_puertos, n_días) y el primer día (epoch)"""
+    first_day = int(arrival_days.min())
+    n_days = int(arrival_days.max()) - first_day + 1
+    cells = ports.astype(np.int64) * n_days + (arrival_days - first_day)
+    arrivals = np.bincount(cells, minlength=n_ports * n_days).reshape(n_ports, n_days)
+    return arrivals, first_day
+
+def berth_capacity(ports, arrival_days, utilization=DEFAULT_UTILIZATION):
+    """Buques atendidos por día en cada puerto para la flota dada.
+
+    Cada puerto atiende al menos sus atraques (`BERTH_CAPACITY`); si la flota trae más
+    llegadas, la capacidad crece hasta que la ocupación media sea `utilization`.
+    """
+    if not 0 < utilization < 1:
+        raise ValueError(f"La utilización debe estar entre 0 y 1 (sin incluir): {utilization}")
+    ports = np.asarray(ports, dtype=np.int64)
+    if len(ports) == 0:
+        return BERTH_CAPACITY.copy()
+    n_days = int(np.max(arrival_days)) - int(np.min(arrival_days)) + 1
+    arrivals_per_day = np.bincount(ports, minlength=len(BERTH_CAPACITY)) / n_days
+    return np.maximum(BERTH_CAPACITY, np.ceil(arrivals_per_day / utilization).astype(np.int64))
+
+def _validate_capacity(capacity):
+    capacity = np.asarray(capacity)
+    if capacity.shape != BERTH_CAPACITY.shape or capacity.dtype.kind not in "iu" or np.any(capacity < 1):
+        raise ValueError(f"La capacidad debe ser un entero >= 1 por puerto destino ({len(BERTH_CAPACITY)} puertos)")
+    return capacity.astype(np.int64)
+
+def berth_backlog(arrivals, capacity):
+    """Buques en espera al cierre de cada día, para todos los puertos a la vez.
+
+    Recursión de Lindley `B[t] = max(0, B[t-1] + llegadas[t] - capacidad)` resuelta sin
+    bucle: con S = suma acumulada de (llegadas - capacidad), B[t] = S[t] - min(0, min S[:t+1]).
+    """
+    net = np.cumsum(arrivals - capacity[:, None], axis=1)
+    return net - np.minimum(np.minimum.accumulate(net, axis=1), 0)
+
+def queue_waits(ports, arrival_days, capacity=None, utilization=DEFAULT_UTILIZATION):
+    """Días de espera de cada buque (FIFO por puerto; dentro del día, en orden de fila).
+
+    Un buque que llega el día t con `p` buques por delante (cola arrastrada del día
+    anterior + llegadas previas del mismo día) atraca `p // capacidad` días después, con
+    tope `MAX_PORT_WAIT_DAYS`. Sin `capacity` se usa `berth_capacity(..., utilization)`.
+    Devuelve las esperas y la cola diaria por puerto.
+    """
+    ports = np.asarray(ports, dtype=np.int64)
+    arrival_days = np.asarray(arrival_days, dtype=np.int64)
+    if capacity is None:
+        capacity = berth_capacity(ports, arrival_days, utilization)
+    capacity = _validate_capacity(capacity)
+    if len(ports) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros((len(capacity), 0), dtype=np.int64), 0
+
+    arrivals, first_day = port_day_arrivals(ports, arrival_days, len(capacity))
+    backlog = berth_backlog(arrivals, capacity)
+    n_days = arrivals.shape[1]
+
+    # Posición de cada buque entre las llegadas de su (puerto, día)
+    cells = ports * n_days + (arrival_days - first_day)
+    order = np.argsort(cells, kind="stable")
+    cell_start = np.zeros(len(capacity) * n_days + 1, dtype=np.int64)
+    np.cumsum(arrivals.ravel(), out=cell_start[1:])
+    rank = np.empty(len(ports), dtype=np.int64)
+    rank[order] = np.arange(len(ports)) - cell_start[cells[order]]
+
+    carried = np.zeros_like(backlog)
+    carried[:, 1:] = backlog[:, :-1]
+    ahead = carried.ravel()[cells] + rank
+    return np.minimum(ahead // capacity[ports], MAX_PORT_WAIT_DAYS), backlog, first_day
+
+def sea_arrival_days(columns):
+    """Día (epoch) de llegada a rada: creación + tránsito base + retraso por riesgo, sin la cola"""
+    risk_delay = columns["delay"].astype(np.int64) - columns["port_wait"]
+    return columns["created_minute"] // MINUTES_PER_DAY + columns["transit_base"] + risk_delay
+
+def fleet_berth_capacity(store, utilization=DEFAULT_UTILIZATION):
+    """`berth_capacity` para las llegadas actuales del almacén"""
+    columns = store.columns
+    return berth_capacity(columns["destination"], sea_arrival_days(columns), utilization)
+
+def apply_port_queues(store, capacity=None, utilization=DEFAULT_UTILIZATION):
+    """Simula las colas de toda la flota y actualiza espera, retraso, ETA y estado.
+
+    Sólo se escriben las filas cuya espera cambió; devuelve esas filas.
+    """
+    columns = store.columns
+    waits, _, _ = queue_waits(columns["destination"], sea_arrival_days(columns), capacity, utilization)
+    rows = np.flatnonzero(waits != columns["port_wait"])
+    if len(rows):
+        store.update_rows(rows, {"port_wait": waits[rows]})
+        recompute_rows(store, rows)
+    return rows
+
+def backlog_frame(store, capacity=None, utilization=DEFAULT_UTILIZATION):
+    """Cola diaria por puerto destino (DataFrame fechas × puertos) para graficar"""
+    columns = store.columns
+    _, backlog, first_day = queue_waits(columns["destination"], sea_arrival_days(columns), capacity, utilization)
+    index = pd.DatetimeIndex(np.arange(first_day, first_day + backlog.shape[1]).astype("datetime64[D]"), name="Fecha")
+    return pd.DataFrame(backlog.T, index=index, columns=DESTINATION_NAMES)
@@ -0,0 +1,105 @@
+import numpy as np
+
+from ports import ORIGIN_INDEX, DESTINATION_INDEX, ORIGIN_NAMES, DESTINATION_NAMES, N_LANES, lane_codes
+from risk_engine import risk_scores, risk_delays, status_codes
+
+MINUTES_PER_DAY = 1440
+
+# Factores de riesgo actualizables y su columna interna en ShipmentStore
+FACTOR_COLUMNS = {
+    "climate": "climate",
+    "congestion": "congestion",
+    "stability": "stability",
+}
+
+# ============================================
+# ÍNDICES PUERTO -> ENVÍOS
+# ============================================
+
+class PortIndex:
+    """Índice CSR de filas por código (orden estable + offsets por código)"""
+
+    def __init__(self, codes, n_codes):
+        # Con enteros de 16 bits el orden estable de numpy es radix sort (lineal)
+        self.rows = np.argsort(codes.astype(np.int16), kind="stable").astype(np.int64)
+        self.offsets = np.zeros(n_codes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=n_codes), out=self.offsets[1:])
+
+    def lookup(self, code):
+        return self.rows[self.offsets[code]:self.offsets[code + 1]]
+
+# ============================================
+# RECÁLCULO INCREMENTAL DE LA FLOTA
+# ============================================
+
+def recompute_rows(store, rows):
+    """Recalcula score, retraso, tránsito total, ETA y estado sólo en `rows`.
+
+    El retraso es el de riesgo más la espera en cola del puerto destino (`port_wait`).
+    """
+    c = store.columns
+    score = risk_scores(c["climate"][rows], c["congestion"][rows], c["stability"][rows])
+    delay = risk_delays(score) + c["port_wait"][rows]
+    transit_total = c["transit_base"][rows] + delay
+    days_to_zero = c["inventory"][rows] / c["consumption"][rows]
+
+    store.update_rows(rows, {
+        "risk_tenths": np.rint(score * 10),
+        "delay": delay,
+        "transit_total": transit_total,
+        "eta_day": c["created_minute"][rows] // MINUTES_PER_DAY + transit_total,
+        "status": status_codes(score, days_to_zero, transit_total),
+    })
+
+class FleetRecalculator:
+    """Aplica lecturas nuevas de clima, congestión o estabilidad por puerto o ruta.
+
+    Los índices se construyen una vez y se reconstruyen sólo cuando el almacén crece;
+    cada actualización toca únicamente los envíos afectados.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._indexed_size = -1
+        self._by_origin = None
+        self._by_destination = None
+        self._by_lane = None
+
+    def _ensure_indexes(self):
+        if self._indexed_size == len(self.store):
+            return
+        c = self.store.columns
+        self._by_origin = PortIndex(c["origin"].astype(np.int64), len(ORIGIN_NAMES))
+        self._by_destination = PortIndex(c["destination"].astype(np.int64), len(DESTINATION_NAMES))
+        self._by_lane = PortIndex(lane_codes(c["origin"], c["destination"]), N_LANES)
+        self._indexed_size = len(self.store)
+
+    def affected_rows(self, origin=None, destination=None):
+        """Filas de un puerto origen, un puerto destino o una ruta (ambos)"""
+        if origin is None and destination is None:
+            raise ValueError("Indica un puerto origen, destino o ambos (ruta)")
+        self._ensure_indexes()
+        if origin is not None and destination is not None:
+            lane = lane_codes(ORIGIN_INDEX[origin], DESTINATION_INDEX[destination])
+            return self._by_lane.lookup(lane)
+        if origin is not None:
+            return self._by_origin.lookup(ORIGIN_INDEX[origin])
+        return self._by_destination.lookup(DESTINATION_INDEX[destination])
+
+    def update_factors(self, origin=None, destination=None, **readings):
+        """Fija nuevas lecturas (0-100) y recalcula los envíos afectados; devuelve sus filas"""
+        unknown = set(readings) - set(FACTOR_COLUMNS)
+        if unknown:
+            raise ValueError(f"Factores desconocidos: {sorted(unknown)}")
+        for name, value in readings.items():
+            if value is not None and not 0 <= value <= 100:
+                raise ValueError(f"{name} debe estar entre 0 y 100")
+
+        rows = self.affected_rows(origin, destination)
+        updates = {FACTOR_COLUMNS[name]: value for name, value in readings.items() if value is not None}
+        if len(rows) == 0 or not updates:
+            return rows
+
+        self.store.update_rows(rows, updates)
+        recompute_rows(self.store, rows)
+        return rows
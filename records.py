@@ -0,0 +1,262 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from ports import (
+    ORIGIN_NAMES, DESTINATION_NAMES, CARGO_NAMES, ORIGIN_INDEX, DESTINATION_INDEX, CARGO_INDEX,
+    ORIGIN_LAT, ORIGIN_LON, DESTINATION_LAT, DESTINATION_LON,
+)
+from risk_engine import STATUS_LABELS
+
+STATUS_NAMES = np.array(STATUS_LABELS, dtype=object)
+STATUS_INDEX = {name: code for code, name in enumerate(STATUS_LABELS)}
+
+INITIAL_CAPACITY = 1024
+
+# Columnas internas compactas: puertos/carga/estado como códigos, fechas como epoch enteros,
+# valores con un decimal (score, días de stock, velocidad) como décimas enteras
+SCHEMA = {
+    "id_num": np.int32,
+    "vessel_num": np.int32,
+    "origin": np.int8,
+    "destination": np.int8,
+    "cargo": np.int8,
+    "status": np.int8,
+    "transit_base": np.int16,
+    "delay": np.int16,
+    "port_wait": np.int16,
+    "transit_total": np.int16,
+    "days_elapsed": np.int16,
+    "eta_day": np.int32,
+    "departure_day": np.int32,
+    "created_minute": np.int32,
+    "inventory": np.int32,
+    "consumption": np.int16,
+    "stock_days_tenths": np.int32,
+    "climate": np.uint8,
+    "congestion": np.uint8,
+    "stability": np.uint8,
+    "risk_tenths": np.int16,
+    "cargo_value": np.int32,
+    "speed_tenths": np.int16,
+    "remaining_nm": np.int32,
+}
+
+# Orden de columnas idéntico al del dict de `generate_shipment_data`
+COLUMNS = [
+    "ID", "Vessel_ID", "Origen", "Destino", "Origin_Lat", "Origin_Lon", "Dest_Lat", "Dest_Lon",
+    "Tránsito_Base", "Retraso", "Espera_Puerto", "Tránsito_Total", "Días_Transcurridos", "ETA", "Fecha_Zarpe",
+    "Inventario_Actual", "Consumo_Diario", "Días_Stock_Cero", "Riesgo_Clima", "Congestión_Puerto",
+    "Estabilidad_Social", "Score_Riesgo", "Estado", "Tipo_Carga", "Valor_Carga_USD",
+    "Velocidad_Nudos", "Distancia_Restante_NM", "Fecha_Creación",
+]
+
+_EPOCH = datetime(1970, 1, 1)
+
+def _epoch_day(date_text):
+    return (datetime.strptime(date_text, "%Y-%m-%d") - _EPOCH).days
+
+def _epoch_minute(datetime_text):
+    return int((datetime.strptime(datetime_text, "%Y-%m-%d %H:%M") - _EPOCH).total_seconds() // 60)
+
+def _day_strings(days):
+    return np.datetime_as_string(days.astype("datetime64[D]"), unit="D").astype(object)
+
+def _minute_strings(minutes):
+    if len(minutes) == 0:
+        return np.array([], dtype=object)
+    text = np.datetime_as_string(minutes.astype(np.int64).astype("datetime64[m]"), unit="m")
+    return np.char.replace(text, "T", " ").astype(object)
+
+def _prefixed(prefix, numbers):
+    return np.char.add(prefix, numbers.astype(str)).astype(object)
+
+# Decodificadores por columna pública: reciben el dict de columnas internas ya recortado
+_DECODERS = {
+    "ID": lambda c: _prefixed("SHP-", c["id_num"]),
+    "Vessel_ID": lambda c: _prefixed("VSL-", c["vessel_num"]),
+    "Origen": lambda c: ORIGIN_NAMES[c["origin"]],
+    "Destino": lambda c: DESTINATION_NAMES[c["destination"]],
+    "Origin_Lat": lambda c: ORIGIN_LAT[c["origin"]],
+    "Origin_Lon": lambda c: ORIGIN_LON[c["origin"]],
+    "Dest_Lat": lambda c: DESTINATION_LAT[c["destination"]],
+    "Dest_Lon": lambda c: DESTINATION_LON[c["destination"]],
+    "Tránsito_Base": lambda c: c["transit_base"].astype(np.int64),
+    "Retraso": lambda c: c["delay"].astype(np.int64),
+    "Espera_Puerto": lambda c: c["port_wait"].astype(np.int64),
+    "Tránsito_Total": lambda c: c["transit_total"].astype(np.int64),
+    "Días_Transcurridos": lambda c: c["days_elapsed"].astype(np.int64),
+    "ETA": lambda c: _day_strings(c["eta_day"]),
+    "Fecha_Zarpe": lambda c: _day_strings(c["departure_day"]),
+    "Inventario_Actual": lambda c: c["inventory"].astype(np.int64),
+    "Consumo_Diario": lambda c: c["consumption"].astype(np.int64),
+    "Días_Stock_Cero": lambda c: c["stock_days_tenths"] / 10,
+    "Riesgo_Clima": lambda c: c["climate"].astype(np.int64),
+    "Congestión_Puerto": lambda c: c["congestion"].astype(np.int64),
+    "Estabilidad_Social": lambda c: c["stability"].astype(np.int64),
+    "Score_Riesgo": lambda c: c["risk_tenths"] / 10,
+    "Estado": lambda c: STATUS_NAMES[c["status"]],
+    "Tipo_Carga": lambda c: CARGO_NAMES[c["cargo"]],
+    "Valor_Carga_USD": lambda c: c["cargo_value"].astype(np.int64),
+    "Velocidad_Nudos": lambda c: c["speed_tenths"] / 10,
+    "Distancia_Restante_NM": lambda c: c["remaining_nm"].astype(np.float64),
+    "Fecha_Creación": lambda c: _minute_strings(c["created_minute"]),
+}
+
+def decode_column(name, columns):
+    """Columna pública `name` a partir de columnas internas (completas o un subconjunto de filas)"""
+    return _DECODERS[name](columns)
+
+def encode_shipment(shipment):
+    """Convierte el dict de un envío a valores de las columnas compactas"""
+    return {
+        "id_num": int(shipment["ID"].split("-")[1]),
+        "vessel_num": int(shipment["Vessel_ID"].split("-")[1]),
+        "origin": ORIGIN_INDEX[shipment["Origen"]],
+        "destination": DESTINATION_INDEX[shipment["Destino"]],
+        "cargo": CARGO_INDEX[shipment["Tipo_Carga"]],
+        "status": STATUS_INDEX[shipment["Estado"]],
+        "transit_base": shipment["Tránsito_Base"],
+        "delay": shipment["Retraso"],
+        "port_wait": shipment["Espera_Puerto"],
+        "transit_total": shipment["Tránsito_Total"],
+        "days_elapsed": shipment["Días_Transcurridos"],
+        "eta_day": _epoch_day(shipment["ETA"]),
+        "departure_day": _epoch_day(shipment["Fecha_Zarpe"]),
+        "created_minute": _epoch_minute(shipment["Fecha_Creación"]),
+        "inventory": shipment["Inventario_Actual"],
+        "consumption": shipment["Consumo_Diario"],
+        "stock_days_tenths": round(shipment["Días_Stock_Cero"] * 10),
+        "climate": shipment["Riesgo_Clima"],
+        "congestion": shipment["Congestión_Puerto"],
+        "stability": shipment["Estabilidad_Social"],
+        "risk_tenths": round(shipment["Score_Riesgo"] * 10),
+        "cargo_value": shipment["Valor_Carga_USD"],
+        "speed_tenths": round(shipment["Velocidad_Nudos"] * 10),
+        "remaining_nm": shipment["Distancia_Restante_NM"],
+    }
+
+# ============================================
+# ALMACÉN COLUMNAR DE ENVÍOS
+# ============================================
+
+class ShipmentRecord:
+    """Vista liviana de una fila del almacén; se indexa igual que el dict original"""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, key):
+        columns = {name: array[self._row:self._row + 1] for name, array in self._store.columns.items()}
+        return _DECODERS[key](columns)[0]
+
+    def keys(self):
+        return list(COLUMNS)
+
+    def to_dict(self):
+        return {key: self[key] for key in COLUMNS}
+
+class ShipmentStore:
+    """Envíos en arrays numpy por columna, con crecimiento amortizado.
+
+    `store["Columna"]` devuelve la columna pública decodificada (misma forma que en el
+    DataFrame) y `store[i]` un `ShipmentRecord`.
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self._size = 0
+        # Se incrementa con cada modificación; sirve para invalidar índices y cachés derivados
+        self.version = 0
+        self._data = {name: np.zeros(capacity, dtype=dtype) for name, dtype in SCHEMA.items()}
+        # Versión de la última modificación de cada fila (para procesar sólo filas cambiadas)
+        self._row_version = np.zeros(capacity, dtype=np.uint32)
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Almacén nuevo a partir de columnas internas (p. ej. un estado histórico)"""
+        store = cls(capacity=max(len(columns["id_num"]), 1))
+        store.extend_columns(columns)
+        return store
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return _DECODERS[key](self.columns)
+        if key < 0:
+            key += self._size
+        if not 0 <= key < self._size:
+            raise IndexError(key)
+        return ShipmentRecord(self, key)
+
+    def __iter__(self):
+        return (ShipmentRecord(self, row) for row in range(self._size))
+
+    @property
+    def columns(self):
+        """Columnas internas recortadas al tamaño actual (vistas, sin copia)"""
+        return {name: array[:self._size] for name, array in self._data.items()}
+
+    @property
+    def nbytes(self):
+        return sum(array[:self._size].nbytes for array in self._data.values())
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        capacity = len(self._data["id_num"])
+        if needed <= capacity:
+            return
+        capacity = max(capacity, 1)
+        while capacity < needed:
+            capacity *= 2
+        for name, array in self._data.items():
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._data[name] = grown
+        grown = np.zeros(capacity, dtype=self._row_version.dtype)
+        grown[:self._size] = self._row_version[:self._size]
+        self._row_version = grown
+
+    def append(self, shipment):
+        """Agrega un envío en formato dict (el de `generate_shipment_data`)"""
+        self._reserve(1)
+        for name, value in encode_shipment(shipment).items():
+            self._data[name][self._size] = value
+        self.version += 1
+        self._row_version[self._size] = self.version
+        self._size += 1
+
+    def extend_columns(self, columns):
+        """Agrega un bloque de envíos ya codificados (dict columna interna -> array)"""
+        count = len(columns["id_num"])
+        self._reserve(count)
+        for name, array in self._data.items():
+            array[self._size:self._size + count] = columns[name]
+        self.version += 1
+        self._row_version[self._size:self._size + count] = self.version
+        self._size += count
+
+    def update_rows(self, rows, columns):
+        """Sobrescribe columnas internas en las filas indicadas (dict columna -> valores)"""
+        for name, values in columns.items():
+            self._data[name][rows] = values
+        self.version += 1
+        self._row_version[rows] = self.version
+
+    def changed_rows(self, since_version):
+        """Filas agregadas o modificadas después de `since_version`"""
+        return np.flatnonzero(self._row_version[:self._size] > since_version)
+
+    def to_frame(self, columns=None):
+        """DataFrame con las columnas públicas decodificadas"""
+        columns = columns or COLUMNS
+        internal = self.columns
+        return pd.DataFrame({name: _DECODERS[name](internal) for name in columns})
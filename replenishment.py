@@ -0,0 +1,118 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from risk_engine import DEFAULT_STOCKOUT_BUFFER
+
+# Días de consumo que debe cubrir cada pedido de reabastecimiento
+DEFAULT_COVER_DAYS = 30
+
+# Envíos que se pueden expeditar por puerto destino y días que recupera cada uno
+DEFAULT_EXPEDITE_SLOTS = 3
+DEFAULT_EXPEDITE_DAYS = 7
+
+# Columnas del plan (también las del plan vacío cuando no hay envíos)
+PLAN_COLUMNS = [
+    "ID", "Destino", "Días_Stock_Cero", "Tránsito_Total", "Días_Sin_Stock", "Día_Reorden",
+    "Cantidad_Reorden", "Expeditar", "Días_Ahorrados", "Días_Sin_Stock_Post",
+]
+
+# ============================================
+# PLAN DE REABASTECIMIENTO POR PUERTO
+# ============================================
+
+def _past(deadline):
+    return deadline is not None and time.perf_counter() > deadline
+
+def _plan_port(ids, port, inventory, consumption, risk_delay, transit_total,
+               stockout_buffer, cover_days, expedite_slots, expedite_days, deadline=None):
+    """Plan vectorizado de un puerto: reorden, cantidades y envíos a expeditar.
+
+    Devuelve `None` si se pasa `deadline` antes de terminar (entre etapas del cálculo).
+    """
+    days_to_zero = inventory / consumption
+    stockout_days = np.maximum(transit_total - days_to_zero, 0)
+
+    # Punto de reorden: el pedido debe llegar con `stockout_buffer` días de margen; el
+    # tiempo de entrega incluye la espera en cola del puerto
+    lead_time = transit_total
+    reorder_day = np.maximum(days_to_zero - lead_time - stockout_buffer, 0)
+    stock_at_arrival = np.maximum(inventory - consumption * (reorder_day + lead_time), 0)
+    reorder_qty = np.maximum(np.ceil(consumption * (cover_days + stockout_buffer) - stock_at_arrival), 0)
+
+    if _past(deadline):
+        return None
+
+    # Con costo unitario por envío, tomar los de mayor ganancia es el óptimo del LP por puerto.
+    # Expeditar acorta el tramo marítimo: recupera retraso por riesgo, no la cola de atraque
+    saved = np.minimum(np.minimum(expedite_days, risk_delay), stockout_days)
+    order = np.lexsort((-consumption, -saved))
+    if _past(deadline):
+        return None
+    expedite = np.zeros(len(ids), dtype=bool)
+    chosen = order[:expedite_slots]
+    expedite[chosen[saved[chosen] > 0]] = True
+    saved = np.where(expedite, saved, 0)
+
+    return pd.DataFrame({
+        "ID": ids,
+        "Destino": port,
+        "Días_Stock_Cero": np.round(days_to_zero, 1),
+        "Tránsito_Total": transit_total,
+        "Días_Sin_Stock": np.round(stockout_days, 1),
+        "Día_Reorden": np.round(reorder_day, 1),
+        "Cantidad_Reorden": reorder_qty.astype(np.int64),
+        "Expeditar": expedite,
+        "Días_Ahorrados": np.round(saved, 1),
+        "Días_Sin_Stock_Post": np.round(stockout_days - saved, 1),
+    })
+
+def iter_replenishment_plan(data, stockout_buffer=DEFAULT_STOCKOUT_BUFFER, cover_days=DEFAULT_COVER_DAYS,
+                            expedite_slots=DEFAULT_EXPEDITE_SLOTS, expedite_days=DEFAULT_EXPEDITE_DAYS,
+                            time_budget_s=None):
+    """Genera (puerto, plan) puerto a puerto, del más al menos comprometido.
+
+    Si se agota `time_budget_s` deja de generar, también a mitad del cálculo de un puerto;
+    los puertos ya entregados son válidos. El primer puerto (el más comprometido) se calcula
+    siempre completo, aunque exceda el presupuesto.
+    """
+    deadline = None if time_budget_s is None else time.perf_counter() + time_budget_s
+
+    # factorize (hash) en lugar de np.unique (ordena 1M de strings): la preparación queda
+    # dentro del presupuesto de tiempo
+    port_codes, ports = pd.factorize(np.asarray(data["Destino"], dtype=object), sort=True)
+    ports = np.asarray(ports, dtype=object)
+    inventory = np.asarray(data["Inventario_Actual"], dtype=np.float64)
+    consumption = np.asarray(data["Consumo_Diario"], dtype=np.float64)
+    transit_total = np.asarray(data["Tránsito_Total"], dtype=np.float64)
+    transit_base = np.asarray(data["Tránsito_Base"], dtype=np.float64)
+    port_wait = np.asarray(data["Espera_Puerto"], dtype=np.float64)
+    risk_delay = transit_total - transit_base - port_wait
+    ids = np.asarray(data["ID"])
+
+    # Puertos con más días sin stock primero, para que los resultados parciales sean los útiles
+    stockout_days = np.maximum(transit_total - inventory / consumption, 0)
+    port_pressure = np.bincount(port_codes, weights=stockout_days, minlength=len(ports))
+    rows_by_port = np.argsort(port_codes, kind="stable")
+    bounds = np.searchsorted(port_codes[rows_by_port], np.arange(len(ports) + 1))
+
+    for position, code in enumerate(np.argsort(-port_pressure, kind="stable")):
+        port_deadline = None if position == 0 else deadline
+        if _past(port_deadline):
+            return
+        rows = rows_by_port[bounds[code]:bounds[code + 1]]
+        plan = _plan_port(
+            ids[rows], ports[code], inventory[rows], consumption[rows], risk_delay[rows], transit_total[rows],
+            stockout_buffer, cover_days, expedite_slots, expedite_days, port_deadline
+        )
+        if plan is None:
+            return
+        yield ports[code], plan
+
+def replenishment_plan(data, **kwargs):
+    """Plan completo de todos los puertos en un único DataFrame"""
+    plans = [plan for _, plan in iter_replenishment_plan(data, **kwargs)]
+    if not plans:
+        return pd.DataFrame(columns=PLAN_COLUMNS)
+    return pd.concat(plans, ignore_index=True)
@@ -0,0 +1,61 @@
+import numpy as np
+
+# ============================================
+# PARÁMETROS DEL MODELO DE RIESGO
+# ============================================
+
+# Pesos de (clima, congestión, estabilidad social) en el score de riesgo
+DEFAULT_WEIGHTS = (0.3, 0.5, 0.2)
+
+# Cortes de score para (RIESGO MEDIO, ALTO RIESGO)
+DEFAULT_THRESHOLDS = (40, 70)
+
+# Días máximos de retraso que aporta un score de 100
+DEFAULT_MAX_DELAY_DAYS = 15
+
+# Días de margen usados por la predicción de desabasto
+DEFAULT_STOCKOUT_BUFFER = 5
+
+# Orden fijo de estados: el índice es el código usado en los arrays
+STATUS_LABELS = ["CRÍTICO", "ALTO RIESGO", "RIESGO MEDIO", "NORMAL"]
+STATUS_CRITICAL, STATUS_HIGH, STATUS_MEDIUM, STATUS_NORMAL = range(4)
+
+STOCKOUT_LABELS = ["DESABASTO INMINENTE", "RIESGO ALTO", "NORMAL"]
+STOCKOUT_ICONS = ["🔴", "🟡", "🟢"]
+STOCKOUT_IMMINENT, STOCKOUT_HIGH, STOCKOUT_NORMAL = range(3)
+
+# ============================================
+# CÁLCULOS VECTORIZADOS
+# ============================================
+
+def risk_scores(climate, congestion, stability, weights=DEFAULT_WEIGHTS):
+    """Score de riesgo vectorizado; admite arrays que se puedan combinar por broadcasting"""
+    w_climate, w_congestion, w_stability = weights
+    score = (np.asarray(climate) * w_climate
+             + np.asarray(congestion) * w_congestion
+             + np.asarray(stability) * w_stability)
+    return np.round(score, 1)
+
+def risk_delays(risk_score, max_delay_days=DEFAULT_MAX_DELAY_DAYS):
+    """Días de retraso derivados del score (truncado como en la versión escalar)"""
+    return np.floor(np.asarray(risk_score) / 100 * max_delay_days).astype(np.int64)
+
+def status_codes(risk_score, days_to_zero, transit_total, thresholds=DEFAULT_THRESHOLDS):
+    """Códigos de estado (índices de STATUS_LABELS) para cada envío"""
+    medium, high = thresholds
+    risk_score = np.asarray(risk_score)
+    critical = np.asarray(days_to_zero) < np.asarray(transit_total)
+    codes = np.where(risk_score > high, STATUS_HIGH,
+                     np.where(risk_score > medium, STATUS_MEDIUM, STATUS_NORMAL))
+    return np.where(critical, STATUS_CRITICAL, codes).astype(np.int8)
+
+def stockout_codes(inventory, daily_consumption, transit_days, threshold_days=DEFAULT_STOCKOUT_BUFFER):
+    """Códigos de predicción de desabasto (índices de STOCKOUT_LABELS)"""
+    buffer = np.asarray(inventory) / np.asarray(daily_consumption) - np.asarray(transit_days)
+    codes = np.where(buffer < 0, STOCKOUT_IMMINENT,
+                     np.where(buffer < threshold_days, STOCKOUT_HIGH, STOCKOUT_NORMAL))
+    return codes.astype(np.int8)
+
+def value_at_risk(cargo_value, risk_score):
+    """Valor de la carga ponderado por el score de riesgo"""
+    return np.asarray(cargo_value) * (np.asarray(risk_score) / 100)
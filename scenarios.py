@@ -0,0 +1,168 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from risk_engine import (
+    DEFAULT_WEIGHTS, DEFAULT_THRESHOLDS, DEFAULT_MAX_DELAY_DAYS, DEFAULT_STOCKOUT_BUFFER,
+    STATUS_LABELS, STOCKOUT_LABELS,
+)
+
+# Celdas (escenarios × envíos) evaluadas por bloque; acota la memoria a unos cientos de MB
+MAX_CELLS_PER_BLOCK = 4_000_000
+
+# ============================================
+# GRILLA DE ESCENARIOS WHAT-IF
+# ============================================
+
+def build_scenario_grid(weights=(DEFAULT_WEIGHTS,), thresholds=(DEFAULT_THRESHOLDS,),
+                        stockout_buffers=(DEFAULT_STOCKOUT_BUFFER,),
+                        max_delay_days=(DEFAULT_MAX_DELAY_DAYS,)):
+    """Producto cartesiano de parámetros; devuelve un dict de arrays con una fila por escenario"""
+    combos = list(itertools.product(weights, thresholds, stockout_buffers, max_delay_days))
+    if not combos:
+        raise ValueError("La grilla de escenarios está vacía")
+    w, t, b, d = zip(*combos)
+    return {
+        "weights": np.asarray(w, dtype=np.float64).reshape(-1, 3),
+        "thresholds": np.asarray(t, dtype=np.float64).reshape(-1, 2),
+        "stockout_buffer": np.asarray(b, dtype=np.float64),
+        "max_delay_days": np.asarray(d, dtype=np.float64),
+    }
+
+def random_scenario_grid(n_scenarios, seed=None):
+    """Grilla aleatoria alrededor de los parámetros por defecto (útil para barridos amplios)"""
+    rng = np.random.default_rng(seed)
+    weights = rng.dirichlet(np.asarray(DEFAULT_WEIGHTS) * 20, size=n_scenarios)
+    medium = rng.uniform(25, 55, n_scenarios)
+    high = medium + rng.uniform(15, 40, n_scenarios)
+    return {
+        "weights": weights,
+        "thresholds": np.column_stack([medium, high]),
+        "stockout_buffer": rng.integers(3, 16, n_scenarios).astype(np.float64),
+        "max_delay_days": rng.integers(8, 23, n_scenarios).astype(np.float64),
+    }
+
+def fleet_arrays(data):
+    """Extrae de un DataFrame (o mapping de columnas) los arrays que necesita el motor"""
+    inventory = np.asarray(data["Inventario_Actual"], dtype=np.float64)
+    consumption = np.asarray(data["Consumo_Diario"], dtype=np.float64)
+    return {
+        "factors": np.vstack([
+            np.asarray(data["Riesgo_Clima"], dtype=np.float64),
+            np.asarray(data["Congestión_Puerto"], dtype=np.float64),
+            np.asarray(data["Estabilidad_Social"], dtype=np.float64),
+        ]),
+        "transit_base": np.asarray(data["Tránsito_Base"], dtype=np.float64),
+        "port_wait": np.asarray(data["Espera_Puerto"], dtype=np.float64),
+        "days_to_zero": inventory / consumption,
+        "cargo_value": np.asarray(data["Valor_Carga_USD"], dtype=np.float64),
+    }
+
+# ============================================
+# EVALUACIÓN BROADCAST (ESCENARIOS × ENVÍOS)
+# ============================================
+
+def _evaluate_block(fleet, grid, start, stop):
+    """Evalúa los escenarios [start, stop) contra toda la flota de una sola vez"""
+    weights = grid["weights"][start:stop]
+    thresholds = grid["thresholds"][start:stop]
+    buffers = grid["stockout_buffer"][start:stop, None]
+    max_delay = grid["max_delay_days"][start:stop, None]
+
+    score = np.round(weights @ fleet["factors"], 1)
+    transit_total = fleet["transit_base"] + fleet["port_wait"] + np.floor(score / 100 * max_delay)
+    margin = fleet["days_to_zero"] - transit_total
+
+    critical = margin < 0
+    above_high = score > thresholds[:, 1:2]
+    above_medium = score > thresholds[:, 0:1]
+
+    n_critical = critical.sum(axis=1)
+    n_high = (above_high & ~critical).sum(axis=1)
+    n_medium = (above_medium & ~above_high & ~critical).sum(axis=1)
+    n_normal = score.shape[1] - n_critical - n_high - n_medium
+
+    stockout_high = ((margin < buffers) & ~critical).sum(axis=1)
+
+    return {
+        STATUS_LABELS[0]: n_critical,
+        STATUS_LABELS[1]: n_high,
+        STATUS_LABELS[2]: n_medium,
+        STATUS_LABELS[3]: n_normal,
+        STOCKOUT_LABELS[0]: n_critical,
+        STOCKOUT_LABELS[1]: stockout_high,
+        "Valor_en_Riesgo": score @ fleet["cargo_value"] / 100,
+        "Valor_Críticos": critical.astype(np.float64) @ fleet["cargo_value"],
+    }
+
+def evaluate_scenarios(data, grid, progress_callback=None):
+    """Conteos por estado y valor en riesgo de cada escenario sobre toda la flota"""
+    fleet = fleet_arrays(data)
+    n_shipments = fleet["transit_base"].shape[0]
+    n_scenarios = grid["weights"].shape[0]
+    block = max(1, MAX_CELLS_PER_BLOCK // max(n_shipments, 1))
+
+    parts = []
+    for start in range(0, n_scenarios, block):
+        stop = min(start + block, n_scenarios)
+        parts.append(_evaluate_block(fleet, grid, start, stop))
+        if progress_callback:
+            progress_callback(stop / n_scenarios)
+
+    results = pd.DataFrame({key: np.concatenate([p[key] for p in parts]) for key in parts[0]})
+    return scenario_frame(grid, results)
+
+def scenario_frame(grid, results):
+    """Parámetros de cada escenario seguidos de sus resultados (una fila por escenario)"""
+    params = pd.DataFrame({
+        "Peso_Clima": grid["weights"][:, 0],
+        "Peso_Congestión": grid["weights"][:, 1],
+        "Peso_Social": grid["weights"][:, 2],
+        "Umbral_Medio": grid["thresholds"][:, 0],
+        "Umbral_Alto": grid["thresholds"][:, 1],
+        "Buffer_Días": grid["stockout_buffer"],
+        "Retraso_Máx": grid["max_delay_days"],
+    })
+    return pd.concat([params, results.reset_index(drop=True)], axis=1)
+
+# ============================================
+# TAREAS PARA EL EJECUTOR EN SEGUNDO PLANO
+# ============================================
+
+def scenario_sweep_block(arrays, chunk, n_chunks):
+    """Evalúa la porción `chunk` de la grilla (arrays de `fleet_arrays` + grilla).
+
+    Con `combine_frames` da los resultados por escenario; `scenario_frame` les agrega los
+    parámetros como en `evaluate_scenarios`.
+    """
+    n_scenarios = arrays["weights"].shape[0]
+    start = chunk * n_scenarios // n_chunks
+    stop = (chunk + 1) * n_scenarios // n_chunks
+    grid = {key: arrays[key] for key in ("weights", "thresholds", "stockout_buffer", "max_delay_days")}
+    fleet = {key: arrays[key] for key in ("factors", "transit_base", "port_wait", "days_to_zero", "cargo_value")}
+    if start == stop:
+        return pd.DataFrame()
+    result = pd.DataFrame(_evaluate_block(fleet, grid, start, stop))
+    result.index = np.arange(start, stop)
+    return result
+
+def monte_carlo_block(arrays, chunk, n_chunks, n_samples, noise_std=10.0, seed=0):
+    """Muestras Monte Carlo de los factores de riesgo (ruido normal acotado a 0-100)"""
+    start = chunk * n_samples // n_chunks
+    stop = (chunk + 1) * n_samples // n_chunks
+    grid = build_scenario_grid()
+    fleet = dict(arrays)
+    rows = []
+    for sample in range(start, stop):
+        rng = np.random.default_rng([seed, sample])
+        noise = rng.normal(0, noise_std, arrays["factors"].shape)
+        fleet["factors"] = np.clip(arrays["factors"] + noise, 0, 100)
+        stats = _evaluate_block(fleet, grid, 0, 1)
+        rows.append({key: value[0] for key, value in stats.items()})
+    return pd.DataFrame(rows, index=np.arange(start, stop))
+
+def combine_frames(parts):
+    """Une los resultados parciales de cada bloque en orden"""
+    parts = [part for part in parts if not part.empty]
+    return pd.concat(parts).sort_index() if parts else pd.DataFrame()
@@ -0,0 +1,35 @@
+import functools
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+LOGO_PATH = os.path.join(STATIC_DIR, "logo.svg")
+
+# Este módulo se importa una sola vez por proceso: la primera ejecución del script es el arranque en frío
+_timings = {"cold_start_ms": None, "last_run_ms": None}
+
+# ============================================
+# ASSETS ESTÁTICOS (CARGADOS UNA VEZ POR PROCESO)
+# ============================================
+
+@functools.lru_cache(maxsize=None)
+def stylesheet():
+    """Bloque <style> del dashboard leído de static/styles.css"""
+    with open(os.path.join(STATIC_DIR, "styles.css"), encoding="utf-8") as handle:
+        return f"<style>\n{handle.read()}</style>"
+
+# ============================================
+# TIEMPOS DE ARRANQUE
+# ============================================
+
+def record_run(run_start):
+    """Registra la duración de la ejecución actual; la primera del proceso es el arranque en frío"""
+    elapsed_ms = (time.perf_counter() - run_start) * 1000
+    _timings["last_run_ms"] = elapsed_ms
+    if _timings["cold_start_ms"] is None:
+        _timings["cold_start_ms"] = elapsed_ms
+        logger.info("Arranque en frío del dashboard: %.0f ms", elapsed_ms)
+    return dict(_timings)
@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generation import IdAllocator, generate_fleet
+from records import ShipmentStore
+
+# 2026-01-01 00:00 en minutos epoch
+NOW_MINUTE = 29_454_720
+
+
+@pytest.fixture
+def make_store():
+    """Almacén con `n` envíos sintéticos reproducibles"""
+    def make(n=2000, seed=0):
+        return ShipmentStore.from_columns(generate_fleet(n, seed, IdAllocator(), NOW_MINUTE))
+    return make
@@ -0,0 +1,86 @@
+import numpy as np
+
+from alerts import AlertEngine, Rule
+from risk_engine import STATUS_LABELS
+
+CRITICAL = STATUS_LABELS.index("CRÍTICO")
+
+
+def rules(buffer=5, threshold=2_000_000):
+    return [
+        Rule("Envío crítico", "status", status="CRÍTICO"),
+        Rule("Desabasto antes de llegada", "stockout_margin", buffer=buffer),
+        Rule("Ruta con alto valor en riesgo", "lane_value_at_risk", severity="media", threshold=threshold),
+    ]
+
+
+def fired(alerts, rule_name):
+    return {alert["shipment"] for alert in alerts if alert["rule"] == rule_name}
+
+
+def stockout_ids(store, buffer):
+    c = store.columns
+    rows = np.flatnonzero(c["stock_days_tenths"] < c["transit_total"].astype(np.int64) * 10 + buffer * 10)
+    return {f"SHP-{number}" for number in c["id_num"][rows]}
+
+
+def test_no_refire_without_changes(make_store):
+    store = make_store()
+    engine = AlertEngine(rules(), max_alerts_per_rule=10**9)
+    first = engine.evaluate(store)
+    assert fired(first, "Envío crítico") == {f"SHP-{n}" for n in store.columns["id_num"][store.columns["status"] == CRITICAL]}
+    assert engine.evaluate(store) == []
+
+
+def test_replace_rules_with_unchanged_rules_does_not_refire(make_store):
+    store = make_store()
+    engine = AlertEngine(rules(), max_alerts_per_rule=10**9)
+    engine.evaluate(store)
+    engine.replace_rules(rules())
+    assert engine.evaluate(store) == []
+
+
+def test_changed_rule_fires_only_for_newly_matching_rows(make_store):
+    store = make_store()
+    engine = AlertEngine(rules(buffer=5), max_alerts_per_rule=10**9)
+    engine.evaluate(store)
+
+    engine.replace_rules(rules(buffer=10))
+    alerts = engine.evaluate(store)
+    expected = stockout_ids(store, 10) - stockout_ids(store, 5)
+    assert expected
+    assert fired(alerts, "Desabasto antes de llegada") == expected
+    # Las reglas sin cambios conservan su estado
+    assert fired(alerts, "Envío crítico") == set()
+    assert not [alert for alert in alerts if alert["rule"] == "Ruta con alto valor en riesgo"]
+
+
+def test_changed_rule_clears_rows_that_stop_matching(make_store):
+    store = make_store()
+    engine = AlertEngine(rules(buffer=10), max_alerts_per_rule=10**9)
+    engine.evaluate(store)
+
+    # Con buffer menor algunas filas dejan de cumplir; al volver a 10 deben alertar otra vez
+    engine.replace_rules(rules(buffer=5))
+    assert fired(engine.evaluate(store), "Desabasto antes de llegada") == set()
+    engine.replace_rules(rules(buffer=10))
+    assert fired(engine.evaluate(store), "Desabasto antes de llegada") == stockout_ids(store, 10) - stockout_ids(store, 5)
+
+
+def test_new_rule_evaluates_whole_fleet(make_store):
+    store = make_store()
+    engine = AlertEngine(rules()[:1], max_alerts_per_rule=10**9)
+    engine.evaluate(store)
+    engine.replace_rules(rules())
+    assert fired(engine.evaluate(store), "Desabasto antes de llegada") == stockout_ids(store, 5)
+
+
+def test_only_changed_rows_fire_after_update(make_store):
+    store = make_store()
+    engine = AlertEngine(rules(), max_alerts_per_rule=10**9)
+    engine.evaluate(store)
+
+    row = int(np.flatnonzero(store.columns["status"] != CRITICAL)[0])
+    store.update_rows(np.array([row]), {"status": np.array([CRITICAL])})
+    alerts = engine.evaluate(store)
+    assert fired(alerts, "Envío crítico") == {f"SHP-{store.columns['id_num'][row]}"}
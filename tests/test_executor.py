@@ -0,0 +1,68 @@
+import os
+from concurrent.futures import CancelledError
+
+import numpy as np
+import pytest
+
+from executor import JobExecutor
+from generation import concat_columns, generation_block
+from scenarios import combine_frames, fleet_arrays, monte_carlo_block
+
+GENERATION_PARAMS = {"n": 5000, "seed": 7, "first_shipment": 1000, "first_vessel": 1000, "now_minute": 0}
+
+
+@pytest.fixture(scope="module")
+def executor():
+    executor = JobExecutor(max_workers=1)
+    yield executor
+    executor.shutdown()
+
+
+def test_result_matches_sequential_run(executor):
+    job = executor.submit(generation_block, {}, concat_columns, GENERATION_PARAMS, n_chunks=2)
+    result = job.result(timeout=120)
+    expected = generation_block({}, 0, 1, **GENERATION_PARAMS)
+    for name in expected:
+        np.testing.assert_array_equal(result[name], expected[name])
+    assert job.progress == 1.0
+
+
+def test_same_inputs_hit_the_cache(executor):
+    params = {**GENERATION_PARAMS, "seed": 8}
+    first = executor.submit(generation_block, {}, concat_columns, params, n_chunks=2)
+    result = first.result(timeout=120)
+
+    second = executor.submit(generation_block, {}, concat_columns, params, n_chunks=2)
+    assert second is not first
+    assert second.done() and second.progress == 1.0
+    assert second.result() is result
+
+    other = executor.submit(generation_block, {}, concat_columns, {**params, "seed": 9}, n_chunks=2)
+    assert other.result(timeout=120) is not result
+
+
+def test_result_after_cancel_raises_cancelled_error(executor, make_store):
+    arrays = fleet_arrays(make_store(2000).to_frame())
+    job = executor.submit(monte_carlo_block, arrays, combine_frames, {"n_samples": 4000}, n_chunks=40)
+    job.cancel()
+    assert job.cancelled
+    with pytest.raises(CancelledError):
+        job.result(timeout=120)
+
+    # La clave cancelada no bloquea un nuevo envío con las mismas entradas
+    again = executor.submit(monte_carlo_block, arrays, combine_frames, {"n_samples": 4000}, n_chunks=40)
+    assert again is not job and not again.cancelled
+    again.cancel()
+    with pytest.raises(CancelledError):
+        again.result(timeout=120)
+
+
+def test_failed_submit_releases_shared_memory():
+    executor = JobExecutor(max_workers=1)
+    executor.shutdown()
+    before = set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else None
+    with pytest.raises(RuntimeError):
+        executor.submit(generation_block, {"values": np.arange(100)}, concat_columns, GENERATION_PARAMS)
+    if before is not None:
+        assert set(os.listdir("/dev/shm")) == before
+    assert not executor._running
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from filters import FleetFilter, FleetIndex
+from ports import CARGO_NAMES, DESTINATION_NAMES, ORIGIN_NAMES
+
+CRITERIA = [
+    FleetFilter(),
+    FleetFilter(statuses=["CRÍTICO"]),
+    FleetFilter(statuses=["CRÍTICO", "NORMAL"], origins=list(ORIGIN_NAMES[:2])),
+    FleetFilter(destinations=[DESTINATION_NAMES[1]], cargos=list(CARGO_NAMES[:3])),
+    FleetFilter(value_range=(100_000, 300_000)),
+    FleetFilter(risk_range=(40.5, 60)),
+    FleetFilter(statuses=["ALTO RIESGO", "RIESGO MEDIO"], value_range=(0, np.inf), risk_range=(30, 70)),
+]
+
+
+def pandas_scan(store, criteria):
+    """Filas que cumplen `criteria` recorriendo el DataFrame completo"""
+    df = store.to_frame()
+    mask = np.ones(len(df), dtype=bool)
+    for column, names in [("Estado", criteria.statuses), ("Origen", criteria.origins),
+                          ("Destino", criteria.destinations), ("Tipo_Carga", criteria.cargos)]:
+        if names is not None:
+            mask &= df[column].isin(names).to_numpy()
+    for column, bounds in [("Valor_Carga_USD", criteria.value_range), ("Score_Riesgo", criteria.risk_range)]:
+        if bounds is not None:
+            mask &= df[column].between(*bounds).to_numpy()
+    if criteria.eta_range is not None:
+        eta = store.columns["eta_day"]
+        mask &= (eta >= criteria.eta_range[0]) & (eta <= criteria.eta_range[1])
+    return np.flatnonzero(mask)
+
+
+@pytest.mark.parametrize("criteria", CRITERIA)
+def test_select_matches_pandas_scan(make_store, criteria):
+    store = make_store()
+    np.testing.assert_array_equal(FleetIndex(store).select(criteria), pandas_scan(store, criteria))
+
+
+def test_select_matches_pandas_scan_after_update_rows(make_store):
+    store = make_store()
+    index = FleetIndex(store)
+    # Se consultan todas las dimensiones antes del cambio para poblar bitmaps, índices y caché
+    for criteria in CRITERIA:
+        index.select(criteria)
+
+    rng = np.random.default_rng(3)
+    rows = rng.choice(len(store), 300, replace=False)
+    store.update_rows(rows, {
+        "status": rng.integers(0, 4, len(rows)),
+        "cargo_value": rng.integers(50_000, 500_001, len(rows)),
+        "risk_tenths": rng.integers(0, 1001, len(rows)),
+        "eta_day": store.columns["eta_day"][rows] + rng.integers(-5, 6, len(rows)),
+    })
+    eta = store.columns["eta_day"]
+    criteria_after = CRITERIA + [FleetFilter(eta_range=(int(np.median(eta)), int(eta.max())))]
+    for criteria in criteria_after:
+        np.testing.assert_array_equal(index.select(criteria), pandas_scan(store, criteria))
+
+
+def test_select_sees_appended_rows(make_store):
+    store = make_store(500)
+    index = FleetIndex(store)
+    criteria = FleetFilter(statuses=["CRÍTICO"], value_range=(100_000, 400_000))
+    index.select(criteria)
+    store.extend_columns(make_store(200, seed=1).columns)
+    np.testing.assert_array_equal(index.select(criteria), pandas_scan(store, criteria))
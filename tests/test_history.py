@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from history import SnapshotStore
+
+DAY0 = datetime(2026, 1, 1)
+
+
+def build_history(make_store, n_days=10, checkpoint_every=3):
+    """Histórico con cambios parciales y altas cada día; devuelve también copias completas por día"""
+    rng = np.random.default_rng(1)
+    store = make_store(500)
+    history = SnapshotStore(checkpoint_every=checkpoint_every)
+    copies, kinds = [], []
+    for day in range(n_days):
+        rows = rng.choice(len(store), 25, replace=False)
+        store.update_rows(rows, {
+            "inventory": rng.integers(100, 501, len(rows)),
+            "status": rng.integers(0, 4, len(rows)),
+        })
+        if day % 3 == 1:
+            store.extend_columns(make_store(20, seed=day).columns)
+        kinds.append(history.snapshot(store, DAY0 + timedelta(days=day)))
+        copies.append({name: array.copy() for name, array in store.columns.items()})
+    return history, copies, kinds
+
+
+def assert_same_columns(actual, expected):
+    assert actual.keys() == expected.keys()
+    for name in expected:
+        np.testing.assert_array_equal(actual[name], expected[name], err_msg=name)
+
+
+def test_history_mixes_checkpoints_and_deltas(make_store):
+    _, _, kinds = build_history(make_store)
+    assert kinds[0] == "full"
+    assert "delta" in kinds and kinds.count("full") >= 2
+
+
+def test_as_of_between_checkpoints_matches_full_copy(make_store):
+    history, copies, kinds = build_history(make_store)
+    for day, expected in enumerate(copies):
+        # A mitad del día: el último snapshot anterior es el de ese día
+        fleet = history.as_of(DAY0 + timedelta(days=day, hours=12))
+        assert_same_columns(fleet.columns, expected)
+    assert any(kind == "delta" for kind in kinds[1:])
+
+
+def test_summary_as_of_matches_reconstructed_fleet(make_store):
+    history, copies, _ = build_history(make_store)
+    day = 5
+    counts = history.summary_as_of(DAY0 + timedelta(days=day))
+    np.testing.assert_array_equal(counts.to_numpy(), np.bincount(copies[day]["status"], minlength=4))
+
+
+def test_as_of_before_first_snapshot_raises(make_store):
+    history, _, _ = build_history(make_store, n_days=2)
+    with pytest.raises(LookupError):
+        history.as_of(DAY0 - timedelta(days=1))
+
+
+def test_snapshots_must_be_chronological(make_store):
+    history = SnapshotStore()
+    store = make_store(10)
+    history.snapshot(store, DAY0)
+    with pytest.raises(ValueError):
+        history.snapshot(store, DAY0 - timedelta(hours=1))